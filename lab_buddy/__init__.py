@@ -0,0 +1,26 @@
+"""LAB Buddy – chemical lookup and logging backed by PubChem.
+
+The lookup engine can be used without the Tk interface::
+
+    from lab_buddy import LabBuddy
+
+    engine = LabBuddy()
+    engine.load_cache()
+    compound = engine.lookup("acetone")
+"""
+
+from lab_buddy.cache import CompoundCache
+from lab_buddy.compound import Compound, normalize_key
+from lab_buddy.core import BatchResult, LabBuddy, SearchCancelled, SearchJob
+from lab_buddy.pubchem import PubChemClient
+
+__all__ = [
+    "BatchResult",
+    "Compound",
+    "CompoundCache",
+    "LabBuddy",
+    "PubChemClient",
+    "SearchCancelled",
+    "SearchJob",
+    "normalize_key",
+]
@@ -0,0 +1,5 @@
+import sys
+
+from lab_buddy.cli import main
+
+sys.exit(main())
@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from lab_buddy.compound import normalize_key
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MEMO = 256    # prefixes remembered
+
+
+class Autocompleter:
+    """Memoized PubChem autocomplete with in-flight request coalescing.
+
+    Answers are kept in an LRU keyed by normalized prefix. A longer prefix is
+    answered by filtering a remembered shorter one whenever that shorter
+    answer was complete (fewer than ``limit`` terms). Concurrent requests for
+    the same prefix share one HTTP call.
+    """
+
+    def __init__(self, client, limit=AUTOCOMPLETE_LIMIT, size=AUTOCOMPLETE_MEMO):
+        self.client = client
+        self.limit = limit
+        self.size = size
+        self.memo = OrderedDict()
+        self.pending = {}
+        self.lock = threading.RLock()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="autocomplete")
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def cached(self, query):
+        """Remembered terms for ``query``, or None if PubChem has to be asked."""
+        q = normalize_key(query)
+
+        with self.lock:
+            if q in self.memo:
+                self.memo.move_to_end(q)
+                return self.memo[q]
+
+            for n in range(len(q) - 1, 0, -1):
+                terms = self.memo.get(q[:n])
+                if terms is not None and len(terms) < self.limit:
+                    return [t for t in terms if normalize_key(t).startswith(q)]
+
+        return None
+
+    def submit(self, query):
+        """Future for the PubChem terms of ``query``, shared with any identical request in flight."""
+        q = normalize_key(query)
+
+        with self.lock:
+            future = self.pending.get(q)
+
+            if future is None:
+                future = self.executor.submit(self.fetch, q)
+                self.pending[q] = future
+                future.add_done_callback(lambda f, q=q: self.forget(q, f))
+
+        return future
+
+    def forget(self, q, future):
+        with self.lock:
+            if self.pending.get(q) is future:
+                del self.pending[q]
+
+    def fetch(self, q):
+        terms = self.client.autocomplete(q, self.limit)
+
+        if terms is not None:
+            with self.lock:
+                self.memo[q] = terms
+                self.memo.move_to_end(q)
+                while len(self.memo) > self.size:
+                    self.memo.popitem(last=False)
+
+        return terms
@@ -0,0 +1,182 @@
+"""Seed the local cache from PubChem's bulk extract files.
+
+PubChem publishes tab-separated, CID-sorted extracts (optionally gzipped)
+at https://ftp.ncbi.nlm.nih.gov/pubchem/Compound/Extras/. Each file adds
+one kind of data to the records it mentions; run them in any order::
+
+    CID-Title       CID  title
+    CID-Synonym-*   CID  synonym          (one line per synonym)
+    CID-SMILES      CID  SMILES
+    CID-IUPAC       CID  IUPAC name
+    CID-Mass        CID  formula  monoisotopic mass  exact mass
+    CID-InChI-Key   CID  InChI  InChIKey
+
+Files are streamed line by line and written in batches, so memory stays
+flat however large the extract is. Progress is committed with each batch;
+an interrupted import resumes from the last batch on the next run.
+"""
+import gzip
+import os
+import time
+
+EXTRACTS = {
+    "CID-Title": "title",
+    "CID-Synonym": "synonym",
+    "CID-SMILES": "smiles",
+    "CID-IUPAC": "iupac",
+    "CID-Mass": "mass",
+    "CID-InChI-Key": "inchikey",
+}
+KINDS = tuple(EXTRACTS.values())
+
+IMPORT_BATCH = 2000      # CIDs written per transaction
+REPORT_INTERVAL = 5      # seconds between progress messages
+
+
+def detect_kind(file_path):
+    """Extract kind of a PubChem file (``CID-SMILES.gz`` -> ``smiles``), or None."""
+    base = os.path.basename(file_path).lower()
+    for prefix, kind in EXTRACTS.items():
+        if base.startswith(prefix.lower()):
+            return kind
+    return None
+
+
+def read_cid_list(file_path):
+    """CIDs of a plain text file, one per line (anything after a tab is ignored)."""
+    cids = set()
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            head = line.split("\t", 1)[0].strip()
+            if head.isdigit():
+                cids.add(int(head))
+    return cids
+
+
+def open_extract(file_path):
+    if file_path.lower().endswith(".gz"):
+        return gzip.open(file_path, "rb")
+    return open(file_path, "rb")
+
+
+def read_groups(f):
+    """Yield ``(cid, rows, offset)`` for each run of lines sharing a CID.
+
+    ``rows`` are the remaining tab-separated columns of each line;
+    ``offset`` is where the next group starts, i.e. a safe resume point.
+    """
+    cid = None
+    rows = []
+
+    while True:
+        offset = f.tell()
+        line = f.readline()
+        if not line:
+            break
+
+        head, _, rest = line.decode("utf-8", "replace").rstrip("\r\n").partition("\t")
+        if not head.isdigit():
+            continue   # header or damaged line
+
+        if int(head) != cid:
+            if rows:
+                yield cid, rows, offset
+            cid = int(head)
+            rows = []
+
+        rows.append(rest.split("\t"))
+
+    if rows:
+        yield cid, rows, f.tell()
+
+
+def record_update(kind, rows):
+    """``(fields, synonyms, extra_term)`` to merge for one CID's rows of an extract."""
+    first = rows[0]
+
+    if kind == "title":
+        return {"name": first[0]}, None, None
+    if kind == "synonym":
+        return {}, [row[0] for row in rows if row[0]], None
+    if kind == "smiles":
+        return {"smiles": first[0]}, None, None
+    if kind == "iupac":
+        return {"iupac": first[0]}, None, None
+    if kind == "mass":
+        # The extract carries monoisotopic/exact masses, not molecular weight
+        return {"formula": first[0]}, None, None
+    if kind == "inchikey":
+        return {}, None, first[-1]
+
+    raise ValueError(f"Unknown extract kind: {kind}")
+
+
+def progress_name(file_path):
+    """Meta key identifying one extract file, so a changed file starts over."""
+    stat = os.stat(file_path)
+    return f"import:{os.path.basename(file_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def import_extract(cache, file_path, kind=None, cids=None, restart=False, log=None,
+                   batch=IMPORT_BATCH):
+    """Merge one PubChem extract into ``cache``. Returns a summary dict.
+
+    ``cids`` limits the import to a curated set of compounds. With
+    ``restart`` any saved progress for the file is ignored.
+    """
+    log = log or (lambda message: None)
+    kind = kind or detect_kind(file_path)
+    if kind not in KINDS:
+        raise ValueError(f"Cannot tell which PubChem extract {os.path.basename(file_path)} is; pass a kind")
+
+    name = progress_name(file_path)
+    saved = None if restart else cache.get_meta(name)
+    summary = {"file": file_path, "kind": kind, "rows": 0, "compounds": 0, "seconds": 0.0}
+
+    if saved == "done":
+        log(f"✓ {os.path.basename(file_path)} already imported")
+        summary["status"] = "done"
+        return summary
+
+    started = time.perf_counter()
+    reported = started
+    pending = 0   # CIDs read since the last commit, imported or filtered out
+
+    with open_extract(file_path) as f:
+        if saved:
+            f.seek(int(saved))
+            log(f"↻ Resuming {os.path.basename(file_path)} at byte {int(saved):,}")
+
+        for cid, rows, offset in read_groups(f):
+            summary["rows"] += len(rows)
+
+            if cids is None or cid in cids:
+                fields, synonyms, term = record_update(kind, rows)
+                key = cache.merge_cid(cid, fields, synonyms)
+                if term:
+                    cache.add_synonym(key, term)
+                summary["compounds"] += 1
+
+            pending += 1
+            if pending >= batch:
+                cache.set_meta(name, str(offset))
+                cache.save()
+                pending = 0
+
+                now = time.perf_counter()
+                if now - reported >= REPORT_INTERVAL:
+                    reported = now
+                    rate = summary["rows"] / (now - started)
+                    log(f"… {summary['compounds']:,} compounds, {rate:,.0f} rows/s")
+
+    cache.set_meta(name, "done")
+    cache.save()
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    cache.build_indices()
+
+    summary["status"] = "imported"
+    rate = summary["rows"] / summary["seconds"] if summary["seconds"] else 0
+    log(f"✓ {os.path.basename(file_path)}: {summary['compounds']:,} compounds "
+        f"in {summary['seconds']:.1f}s ({rate:,.0f} rows/s)")
+
+    return summary
@@ -0,0 +1,139 @@
+"""Portable cache bundles, for warming one workstation's cache from another's.
+
+A bundle is a gzipped JSON-lines file: a header line, one line per cached
+record (with its synonyms), and a final signature line. The signature is
+a SHA-256 hash of everything before it, or an HMAC-SHA256 when the lab
+shares a secret key, in which case only bundles made with that key merge.
+
+Merging keeps the newest record per PubChem CID (by ``ts``), so bundles
+can be exchanged in either direction and merged repeatedly.
+"""
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import time
+
+from lab_buddy.compound import normalize_key
+
+BUNDLE_FORMAT = "lab-buddy-cache"
+BUNDLE_VERSION = 1
+BUNDLE_KEY_ENV = "LAB_BUDDY_BUNDLE_KEY"
+
+
+class BundleError(ValueError):
+    """The file is not a LAB Buddy bundle, or it fails its signature check."""
+
+
+def bundle_key(key=None):
+    key = key or os.environ.get(BUNDLE_KEY_ENV)
+    return key.encode("utf-8") if key else None
+
+
+def new_signer(key):
+    return hmac.new(key, digestmod=hashlib.sha256) if key else hashlib.sha256()
+
+
+def encode_line(item):
+    return (json.dumps(item, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def export_bundle(cache, file_path, since=0, key=None):
+    """Write every record updated at or after ``since`` (epoch seconds). Returns the record count."""
+    signer = new_signer(bundle_key(key))
+    tmp_path = f"{file_path}.tmp"
+    count = 0
+
+    with gzip.open(tmp_path, "wb") as f:
+        def write(item):
+            line = encode_line(item)
+            signer.update(line)
+            f.write(line)
+
+        write({
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "created": int(time.time()),
+            "since": since,
+            "signed": signer.name.startswith("hmac"),
+        })
+
+        for record_key, data in cache.iter_records(since=since):
+            write({"data": data, "synonyms": cache.synonyms(record_key)})
+            count += 1
+
+        f.write(encode_line({"signature": signer.hexdigest()}))
+
+    os.replace(tmp_path, file_path)
+    return count
+
+
+def read_lines(file_path):
+    try:
+        with gzip.open(file_path, "rb") as f:
+            yield from f
+    except (OSError, EOFError) as e:
+        raise BundleError(f"Not a LAB Buddy cache bundle: {e}") from e
+
+
+def verify_bundle(file_path, key=None):
+    """Header of a bundle whose signature checks out; raises ``BundleError`` otherwise.
+
+    Reads the file once without keeping it in memory.
+    """
+    signer = new_signer(bundle_key(key))
+    header = None
+    last = None
+
+    for line in read_lines(file_path):
+        if last is not None:
+            signer.update(last)
+        last = line
+        if header is None:
+            try:
+                header = json.loads(line)
+            except ValueError:
+                header = {}
+            if header.get("format") != BUNDLE_FORMAT:
+                raise BundleError("Not a LAB Buddy cache bundle")
+
+    try:
+        signature = json.loads(last)["signature"]
+    except (TypeError, ValueError, KeyError):
+        raise BundleError("Bundle is truncated (no signature)")
+
+    if not hmac.compare_digest(signature, signer.hexdigest()):
+        if header.get("signed"):
+            raise BundleError("Bundle signature does not match; check the shared key")
+        raise BundleError("Bundle integrity check failed")
+
+    return header
+
+
+def merge_bundle(cache, file_path, key=None, log=None):
+    """Merge a verified bundle into ``cache``. Returns counts of added, updated and kept records."""
+    log = log or (lambda message: None)
+    header = verify_bundle(file_path, key)
+    if header.get("version", 0) > BUNDLE_VERSION:
+        raise BundleError("Bundle was made by a newer LAB Buddy")
+
+    counts = {"added": 0, "updated": 0, "kept": 0}
+
+    for number, line in enumerate(read_lines(file_path)):
+        item = json.loads(line)
+        data = item.get("data")
+        if not isinstance(data, dict) or not data.get("name"):
+            continue   # header or signature
+
+        result = cache.merge_record(normalize_key(data["name"]), data, item.get("synonyms") or ())
+        counts[result or "kept"] += 1
+
+        if number % 1000 == 0:
+            cache.save()
+
+    cache.save()
+    log(f"✓ Merged {os.path.basename(file_path)}: {counts['added']} added, "
+        f"{counts['updated']} updated, {counts['kept']} already up to date")
+
+    return counts
@@ -0,0 +1,805 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from lab_buddy.cas import is_valid_cas
+from lab_buddy.compound import Compound, normalize_key
+from lab_buddy.index import PrefixIndex, TrigramIndex
+from lab_buddy.paths import CACHE_DB_FILE, CACHE_FILE, CACHE_SIG_FILE
+from lab_buddy.pubchem import NOT_AVAILABLE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS compounds (
+    key       TEXT PRIMARY KEY,
+    cid       INTEGER,
+    name      TEXT NOT NULL,
+    cas       TEXT,
+    iupac_key TEXT,
+    smiles    TEXT,
+    ts        INTEGER NOT NULL DEFAULT 0,
+    data      TEXT NOT NULL,
+    checksum  TEXT
+);
+CREATE INDEX IF NOT EXISTS compounds_cid ON compounds (cid);
+CREATE INDEX IF NOT EXISTS compounds_cas ON compounds (cas);
+CREATE INDEX IF NOT EXISTS compounds_iupac ON compounds (iupac_key);
+CREATE INDEX IF NOT EXISTS compounds_smiles ON compounds (smiles);
+
+CREATE TABLE IF NOT EXISTS synonyms (
+    term TEXT NOT NULL,
+    key  TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (term, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS synonyms_key ON synonyms (key);
+
+CREATE TABLE IF NOT EXISTS cas_cids (
+    cas TEXT PRIMARY KEY,
+    cid INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COMPACT_RATIO = 0.25       # free pages / total pages before the database is vacuumed
+COMPACT_MIN_PAGES = 256    # never bother compacting databases smaller than this
+SYNONYM_LIMIT = 500        # synonyms stored per compound, in PubChem's order
+SYNONYM_MAX_LENGTH = 100   # longer "synonyms" are systematic names nobody types
+SYNONYM_INDEXED = 10       # leading synonyms also fed to the in-memory indices
+BUSY_TIMEOUT = 30          # seconds a write waits for another process's transaction
+
+
+def compute_hash(raw_bytes: bytes) -> str:
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+def record_checksum(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def known(value):
+    """``value``, or None for an empty field or PubChem's "Not available" placeholder."""
+    return value if value and value != NOT_AVAILABLE else None
+
+
+def synonym_terms(synonyms):
+    """Normalized, de-duplicated synonyms worth storing, most common first."""
+    terms = []
+    seen = set()
+
+    for synonym in synonyms:
+        term = normalize_key(synonym)
+        if term and len(term) <= SYNONYM_MAX_LENGTH and term not in seen:
+            seen.add(term)
+            terms.append(term)
+            if len(terms) >= SYNONYM_LIMIT:
+                break
+
+    return terms
+
+
+def is_corruption(error):
+    """True if a SQLite error means the file itself is damaged, not merely busy or unreadable."""
+    message = str(error).lower()
+    return "not a database" in message or "malformed" in message
+
+
+def read_legacy_cache(path=CACHE_FILE, sig_path=CACHE_SIG_FILE):
+    """Records of the old signed ``chemical_cache.json``, or {} if missing or invalid."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+
+        with open(sig_path, "r") as sig:
+            stored_hash = sig.read().strip()
+
+        if compute_hash(raw) != stored_hash:
+            raise ValueError("Cache integrity check failed")
+
+        return json.loads(raw.decode("utf-8"))
+
+    except Exception:
+        return {}
+
+
+class CompoundCache:
+    """Local offline store of looked-up compounds.
+
+    Records live in a SQLite database (WAL mode) keyed by normalized preferred
+    name, with indexed CID, CAS number, IUPAC name and SMILES columns and a
+    synonym table, so lookups never load the whole cache. ``add`` upserts a single row and
+    ``save`` commits pending rows.
+
+    Every row carries its own checksum. A record that fails verification is
+    dropped on read instead of invalidating the cache, and ``maintain``
+    salvages damaged databases and compacts away dead pages.
+
+    Several processes (two windows, the window and a script) can share one
+    database: SQLite serializes their writes, and ``refresh`` feeds rows
+    committed by the others into this process's in-memory indices.
+    """
+
+    def __init__(self, path=CACHE_DB_FILE, legacy_path=CACHE_FILE, legacy_sig_path=CACHE_SIG_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.legacy_sig_path = legacy_sig_path
+        self.conn = None
+        self.lock = threading.RLock()
+        self.discarded = 0
+        self.damaged = set()   # keys of records that failed verification, deleted on save
+        self.prefix_index = PrefixIndex()
+        self.fuzzy_index = TrigramIndex()
+        self.inode = None
+        self.data_version = None
+        self.indexed_rowid = 0
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM compounds").fetchone()[0]
+
+    def __contains__(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM compounds WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(compounds)")}
+        if "checksum" not in columns:
+            conn.execute("ALTER TABLE compounds ADD COLUMN checksum TEXT")
+
+        self.inode = os.stat(self.path).st_ino
+        return conn
+
+    def load(self):
+        """Open the database, migrating the legacy JSON cache on first use.
+
+        Returns False if an unreadable database had to be set aside.
+        """
+        with self.lock:
+            try:
+                self.conn = self.connect()
+                healthy = True
+            except sqlite3.DatabaseError as e:
+                if not is_corruption(e):
+                    raise   # locked or inaccessible: a healthy cache must not be set aside
+                os.replace(self.path, self.path + ".corrupt")
+                self.conn = self.connect()
+                healthy = False
+
+            self.migrate_legacy()
+            self.index_cas()
+            self.clear_placeholders()
+
+        try:
+            self.build_indices()
+        except sqlite3.DatabaseError as e:
+            if not is_corruption(e):
+                raise
+            # Damaged pages: lookups still work row by row until maintain() rebuilds and re-indexes
+
+        return healthy
+
+    def indexed_rows(self, after=0):
+        """Rows with rowid > ``after`` and their leading synonyms, as fed to the indices."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT rowid, key, name, cas, iupac_key FROM compounds WHERE rowid > ? ORDER BY rowid",
+                (after,)
+            ).fetchall()
+            synonyms = self.conn.execute(
+                "SELECT s.term, c.name FROM synonyms s JOIN compounds c ON c.key = s.key "
+                "WHERE c.rowid > ? AND s.rank < ?",
+                (after, SYNONYM_INDEXED)
+            ).fetchall()
+
+        return rows, synonyms
+
+    def build_indices(self):
+        """Fill the in-memory suggestion and fuzzy indices from the database."""
+        with self.lock:
+            self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            rows, synonyms = self.indexed_rows()
+            if rows:
+                self.indexed_rowid = rows[-1][0]
+
+        items = []
+        fuzzy = []
+        for _, key, name, cas, iupac in rows:
+            items.append((key, name))
+            fuzzy.append((key, name))
+            if cas:
+                items.append((cas, name))
+            if iupac:
+                fuzzy.append((iupac, name))
+
+        items += synonyms
+        fuzzy += synonyms
+
+        self.prefix_index.build(items)
+        self.fuzzy_index.build(fuzzy)
+
+    def refresh(self):
+        """Index rows other processes committed since the last call. Returns how many.
+
+        ``PRAGMA data_version`` only changes when another connection commits,
+        so a check with nothing new costs one trivial query. A database
+        swapped out by another process's ``rebuild`` is reopened. Meant
+        for a background thread: it queries the database and takes the lock.
+        """
+        with self.lock:
+            if self.conn is None:
+                return 0   # not loaded yet, or closed
+
+            if self.reopen_if_replaced():
+                self.build_indices()
+                return len(self)
+
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self.data_version:
+                return 0
+
+            self.data_version = version
+            rows, synonyms = self.indexed_rows(self.indexed_rowid)
+            if rows:
+                self.indexed_rowid = rows[-1][0]
+
+        for _, key, name, cas, iupac in rows:
+            self.prefix_index.add(key, name)
+            self.prefix_index.add(cas, name)
+            self.fuzzy_index.add(key, name)
+            self.fuzzy_index.add(iupac, name)
+
+        for term, name in synonyms:
+            self.prefix_index.add(term, name)
+            self.fuzzy_index.add(term, name)
+
+        return len(rows)
+
+    def reopen_if_replaced(self):
+        """Reopen the database if its file was swapped out under this connection. Returns True if so.
+
+        ``rebuild`` never swaps the file, but a cache set aside by another
+        process or an older LAB Buddy would otherwise keep receiving writes
+        after it was unlinked.
+        """
+        with self.lock:
+            try:
+                replaced = os.stat(self.path).st_ino != self.inode
+            except OSError:
+                return False   # mid-swap; look again next time
+
+            # Rows already pending belong to the old file and cannot be moved
+            if replaced and not self.conn.in_transaction:
+                self.conn.close()
+                self.conn = self.connect()
+                return True
+
+        return False
+
+    def migrate_legacy(self):
+        done = self.conn.execute("SELECT value FROM meta WHERE name = 'legacy_migrated'").fetchone()
+        if done:
+            return 0
+
+        entries = read_legacy_cache(self.legacy_path, self.legacy_sig_path)
+
+        with self.conn:
+            for key, data in entries.items():
+                self.put(key, data)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('legacy_migrated', ?)",
+                (str(len(entries)),)
+            )
+
+        return len(entries)
+
+    def index_cas(self):
+        """Fill ``cas_cids`` from records cached before the table existed (runs once)."""
+        done = self.conn.execute("SELECT value FROM meta WHERE name = 'cas_indexed'").fetchone()
+        if done:
+            return
+
+        rows = self.conn.execute(
+            "SELECT cas, cid FROM compounds WHERE cas IS NOT NULL AND cid IS NOT NULL"
+        ).fetchall()
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO cas_cids (cas, cid) VALUES (?, ?)",
+                [(cas, cid) for cas, cid in rows if is_valid_cas(cas)]
+            )
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('cas_indexed', '1')")
+
+    def clear_placeholders(self):
+        """Null out "Not available" stored in lookup columns by earlier versions (runs once)."""
+        done = self.conn.execute("SELECT value FROM meta WHERE name = 'placeholders_cleared'").fetchone()
+        if done:
+            return
+
+        with self.conn:
+            self.conn.execute("UPDATE compounds SET cas = NULL WHERE cas = ?", (NOT_AVAILABLE.lower(),))
+            self.conn.execute("UPDATE compounds SET iupac_key = NULL WHERE iupac_key = ?", (NOT_AVAILABLE.lower(),))
+            self.conn.execute("UPDATE compounds SET smiles = NULL WHERE smiles = ?", (NOT_AVAILABLE,))
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('placeholders_cleared', '1')")
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def put(self, key, data):
+        """Upsert one record (cache-layout dict). Not committed until ``save``."""
+        cas = (known(data.get("cas")) or "").lower() or None
+        iupac = normalize_key(data["iupac"]) if known(data.get("iupac")) else None
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+        with self.lock:
+            self.reopen_if_replaced()
+            self.damaged.discard(key)   # replaced by a good record before the next save
+            self.conn.execute(
+                "INSERT OR REPLACE INTO compounds (key, cid, name, cas, iupac_key, smiles, ts, data, checksum) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    data.get("cid"),
+                    data.get("name", ""),
+                    cas,
+                    iupac,
+                    known(data.get("smiles")),
+                    data.get("ts") or 0,
+                    text,
+                    record_checksum(text),
+                )
+            )
+
+        if cas and data.get("cid") and is_valid_cas(cas):
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cas_cids (cas, cid) VALUES (?, ?)", (cas, data["cid"])
+                )
+
+        name = data.get("name", "")
+        self.prefix_index.add(key, name)
+        self.prefix_index.add(cas, name)
+        self.fuzzy_index.add(key, name)
+        self.fuzzy_index.add(iupac, name)
+
+    def put_synonyms(self, key, synonyms):
+        """Replace the synonyms of one record. Not committed until ``save``."""
+        terms = synonym_terms(synonyms)
+
+        with self.lock:
+            self.conn.execute("DELETE FROM synonyms WHERE key = ?", (key,))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO synonyms (term, key, rank) VALUES (?, ?, ?)",
+                [(term, key, rank) for rank, term in enumerate(terms)]
+            )
+            row = self.conn.execute("SELECT name FROM compounds WHERE key = ?", (key,)).fetchone()
+
+        name = row[0] if row else key
+        for term in terms[:SYNONYM_INDEXED]:
+            self.prefix_index.add(term, name)
+            self.fuzzy_index.add(term, name)
+
+        return len(terms)
+
+    def cid_for_cas(self, cas):
+        """CID of a CAS number resolved before, cached compound or not."""
+        with self.lock:
+            row = self.conn.execute("SELECT cid FROM cas_cids WHERE cas = ?", (cas.lower(),)).fetchone()
+        return row[0] if row else None
+
+    def remember_cas(self, mapping):
+        """Record CAS number -> CID resolutions. Not committed until ``save``."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cas_cids (cas, cid) VALUES (?, ?)",
+                [(cas.lower(), cid) for cas, cid in mapping.items()]
+            )
+
+    def add_synonym(self, key, term):
+        """Append one extra lookup term (e.g. an InChIKey) to a record's synonyms."""
+        term = normalize_key(term)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO synonyms (term, key, rank) "
+                "SELECT ?, ?, COALESCE(MAX(rank) + 1, 0) FROM synonyms WHERE key = ?",
+                (term, key, key)
+            )
+
+    def free_key(self, name, cid):
+        """``(key, name)`` to store ``cid`` under, normally ``name`` itself.
+
+        Titles are not unique (CIDs 5793 and 79025 are both "Glucose"); when
+        another compound already holds the key, the name gets the CID appended.
+        """
+        key = normalize_key(name)
+        with self.lock:
+            row = self.conn.execute("SELECT cid FROM compounds WHERE key = ?", (key,)).fetchone()
+
+        if row is None or row[0] == cid:
+            return key, name
+
+        name = f"{name} (CID {cid})"
+        return normalize_key(name), name
+
+    def merge_cid(self, cid, fields=None, synonyms=None):
+        """Create or update the record of ``cid`` from bulk data. Not committed until ``save``.
+
+        Records created without a name are named after their CID until a
+        title or synonym turns up, and are then re-keyed under that name.
+        A title (``fields["name"]``) also replaces a name taken from a
+        synonym, so extracts can be imported in any order; the names of
+        records fetched from PubChem are kept and the title is stored as a
+        synonym. Synonyms are added to the ones already stored. A name
+        another compound already has is disambiguated by ``free_key``.
+        Returns the record's key.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT key, data, checksum FROM compounds WHERE cid = ?", (cid,)
+            ).fetchone()
+
+        data = self.verified(*row) if row else None
+        old_key = row[0] if data else None
+        data = data or {"cid": cid, "name": str(cid), "ts": 0}
+
+        fields = dict(fields or {})
+        title = fields.pop("name", None)
+        data.update(fields)
+
+        placeholder = data.get("name") == str(cid)
+        seeded = not data.get("ts")   # created by a bulk import, not fetched from PubChem
+        if title and (placeholder or seeded):
+            data["name"] = title
+            title = None
+        elif placeholder and synonyms:
+            data["name"] = synonyms[0]
+
+        if synonyms and not is_valid_cas(data.get("cas") or ""):
+            cas = next((s for s in synonyms if is_valid_cas(s)), None)
+            if cas:
+                data["cas"] = cas
+
+        extra = [title] if title else []
+
+        with self.lock:
+            name = data["name"]
+            key, data["name"] = self.free_key(name, cid)
+            if data["name"] != name:
+                extra.append(name)   # still found under the shared name, as a synonym
+
+            if old_key and old_key != key:
+                self.conn.execute("DELETE FROM compounds WHERE key = ?", (old_key,))
+                self.conn.execute("UPDATE OR IGNORE synonyms SET key = ? WHERE key = ?", (key, old_key))
+                self.conn.execute("DELETE FROM synonyms WHERE key = ?", (old_key,))
+
+            self.put(key, data)
+
+        if synonyms:
+            stored = self.synonyms(key)   # e.g. InChIKeys or titles from earlier extracts
+            self.put_synonyms(key, synonyms)
+            kept = set(synonym_terms(synonyms))
+            extra += [term for term in stored if term not in kept]
+
+        for term in extra:
+            self.add_synonym(key, term)
+
+        return key
+
+    def get_meta(self, name):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name, value):
+        """Not committed until ``save``, so it lands in the same transaction as pending rows."""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def synonyms(self, key):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT term FROM synonyms WHERE key = ? ORDER BY rank", (key,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def verified(self, key, text, checksum):
+        """Decoded record, or None (and the row dropped) if it fails its checksum."""
+        try:
+            # Rows written before checksums existed carry none
+            if checksum is not None and record_checksum(text) != checksum:
+                raise ValueError("checksum mismatch")
+            return json.loads(text)
+
+        except (TypeError, ValueError):
+            self.discard(key)
+            return None
+
+    def discard(self, key):
+        """Drop one record with the next ``save``.
+
+        Reads call this, so it must not write (and so lock the database
+        for other processes) or commit another thread's pending rows.
+        """
+        with self.lock:
+            self.damaged.add(key)
+            self.discarded += 1
+
+    def get_data(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, checksum FROM compounds WHERE key = ?", (key,)
+            ).fetchone()
+        return self.verified(key, *row) if row else None
+
+    def find_key(self, query):
+        """Cache key for a name, CAS number, IUPAC name, SMILES string or synonym."""
+        query = query.strip()
+        key = normalize_key(query)
+
+        with self.lock:
+            row = (
+                self.conn.execute("SELECT key FROM compounds WHERE key = ?", (key,)).fetchone()
+                or self.conn.execute("SELECT key FROM compounds WHERE cas = ?", (query.lower(),)).fetchone()
+                or self.conn.execute("SELECT key FROM compounds WHERE iupac_key = ?", (key,)).fetchone()
+                or self.conn.execute("SELECT key FROM compounds WHERE smiles = ?", (query,)).fetchone()
+                or self.conn.execute(
+                    "SELECT key FROM synonyms WHERE term = ? ORDER BY rank LIMIT 1", (key,)
+                ).fetchone()
+            )
+
+        return row[0] if row else None
+
+    def get(self, query):
+        key = self.find_key(query)
+
+        if key is None:
+            return None
+
+        data = self.get_data(key)
+        return Compound.from_cache(data) if data else None
+
+    def get_by_cid(self, cid):
+        with self.lock:
+            row = self.conn.execute("SELECT key FROM compounds WHERE cid = ?", (cid,)).fetchone()
+
+        data = self.get_data(row[0]) if row else None
+        return Compound.from_cache(data) if data else None
+
+    def add(self, compound):
+        key = compound.key
+        self.put(key, compound.to_cache())
+        if compound.synonyms:
+            self.put_synonyms(key, compound.synonyms)
+        return key
+
+    def save(self):
+        with self.lock:
+            for key in self.damaged:
+                self.conn.execute("DELETE FROM compounds WHERE key = ?", (key,))
+                self.conn.execute("DELETE FROM synonyms WHERE key = ?", (key,))
+            self.damaged.clear()
+            self.conn.commit()
+
+    def iter_records(self, since=0, batch=500):
+        """Yield ``(key, data)`` of every verified row with ``ts`` >= ``since``, in insertion order.
+
+        Only one batch of ``batch`` rows is held in memory, and the lock is
+        released between batches so lookups are not blocked by long exports.
+        """
+        last = 0
+
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT rowid, key, data, checksum FROM compounds "
+                    "WHERE rowid > ? AND ts >= ? ORDER BY rowid LIMIT ?",
+                    (last, since, batch)
+                ).fetchall()
+
+            if not rows:
+                return
+
+            for rowid, key, text, checksum in rows:
+                data = self.verified(key, text, checksum)
+                if data:
+                    yield key, data
+
+            last = rows[-1][0]
+
+    def iter_compounds(self, batch=500):
+        """Yield every verified cached ``Compound`` in insertion order."""
+        for key, data in self.iter_records(batch=batch):
+            yield Compound.from_cache(data)
+
+    def merge_record(self, key, data, synonyms=()):
+        """Take a record from another cache if it is new here or newer than ours.
+
+        Records are matched by CID (by key if they have none) and the larger
+        ``ts`` wins; a name another compound already has is disambiguated
+        by ``free_key``. Returns "added", "updated" or None if ours was kept.
+        Not committed until ``save``.
+        """
+        with self.lock:
+            if data.get("cid"):
+                row = self.conn.execute(
+                    "SELECT key, ts FROM compounds WHERE cid = ?", (data["cid"],)
+                ).fetchone()
+            else:
+                row = self.conn.execute("SELECT key, ts FROM compounds WHERE key = ?", (key,)).fetchone()
+
+            if row and row[1] >= (data.get("ts") or 0):
+                return None
+
+            name = data["name"]
+            key, data["name"] = self.free_key(name, data.get("cid"))
+            if data["name"] != name:
+                synonyms = [name, *synonyms]
+
+            if row and row[0] != key:
+                self.conn.execute("DELETE FROM compounds WHERE key = ?", (row[0],))
+                self.conn.execute("DELETE FROM synonyms WHERE key = ?", (row[0],))
+
+            self.put(key, data)
+            if synonyms:
+                self.put_synonyms(key, synonyms)
+
+        return "updated" if row else "added"
+
+    def suggestions(self, query, limit=6):
+        """Cached names whose name or CAS number starts with ``query``, then close matches.
+
+        Only the in-memory indices are consulted (never the database or the
+        cache lock), so this is safe on the UI thread, even before ``load``.
+        """
+        query = normalize_key(query)
+        names = self.prefix_index.search(query, limit)
+
+        if len(names) < limit and len(query) >= 3:
+            for name, _ in self.fuzzy_index.search(query, limit):
+                if name not in names:
+                    names.append(name)
+
+        return names[:limit]
+
+    def closest(self, query, limit=6):
+        """(name, score) pairs of cached compounds whose name or IUPAC name resembles ``query``."""
+        return self.fuzzy_index.search(normalize_key(query), limit)
+
+    # ================= MAINTENANCE =================
+
+    def maintain(self):
+        """Integrity check plus compaction, meant to run on a background thread.
+
+        A damaged database is rebuilt from its readable, verified rows. A
+        healthy one is vacuumed once free (dead) pages pass ``COMPACT_RATIO``.
+        Returns a short description of what was done, or None.
+        """
+        try:
+            check = sqlite3.connect(self.path)
+            try:
+                result = check.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                check.close()
+        except sqlite3.DatabaseError:
+            result = "unreadable"
+
+        if result != "ok":
+            counts = self.rebuild()
+            if counts is None:
+                return "damaged; rebuild postponed while another LAB Buddy has the cache open"
+            return f"rebuilt ({counts[0]} kept, {counts[1]} damaged records skipped)"
+
+        with self.lock:
+            pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+            if pages >= COMPACT_MIN_PAGES and free / pages >= COMPACT_RATIO:
+                self.conn.commit()
+                self.conn.execute("VACUUM")
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                return f"compacted ({free} of {pages} pages freed)"
+
+        return None
+
+    def rebuild(self):
+        """Copy every readable, verified record into a fresh database and write it back over this one.
+
+        Runs only while no other process has the cache open: the work is
+        done on a connection holding SQLite's exclusive lock, and the fresh
+        copy is written back with the backup API, so the file (and the
+        WAL other connections rely on) is never unlinked or swapped.
+        Returns ``(kept, skipped)``, or None if another process holds the
+        cache and the rebuild has to wait for a later start.
+        """
+        tmp_path = self.path + ".rebuild"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+            guard = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+            fresh = sqlite3.connect(tmp_path)
+
+            try:
+                guard.execute("PRAGMA locking_mode=EXCLUSIVE")
+                # Kept until the connection closes; fails if anyone else has the file open
+                guard.execute("BEGIN EXCLUSIVE")
+                guard.execute("COMMIT")
+            except sqlite3.OperationalError:
+                guard.close()
+                fresh.close()
+                os.remove(tmp_path)
+                self.conn = self.connect()
+                return None
+
+            try:
+                fresh.executescript(SCHEMA)
+                kept, skipped = self.salvage(guard, fresh)
+                fresh.commit()
+                fresh.backup(guard)
+            finally:
+                guard.close()
+                fresh.close()
+                os.remove(tmp_path)
+                self.conn = self.connect()
+
+        self.build_indices()
+        return kept, skipped
+
+    @staticmethod
+    def salvage(source, fresh):
+        """Copy readable, verified rows of ``source`` into ``fresh``. Returns ``(kept, skipped)``."""
+        try:
+            max_rowid = source.execute("SELECT MAX(rowid) FROM compounds").fetchone()[0] or 0
+        except sqlite3.DatabaseError:
+            max_rowid = 0
+
+        kept = skipped = 0
+
+        # Row by row, so one damaged page only costs the records on it
+        for rowid in range(1, max_rowid + 1):
+            try:
+                row = source.execute(
+                    "SELECT key, cid, name, cas, iupac_key, smiles, ts, data, checksum "
+                    "FROM compounds WHERE rowid = ?", (rowid,)
+                ).fetchone()
+            except sqlite3.DatabaseError:
+                skipped += 1
+                continue
+
+            if row is None:
+                continue
+
+            if row[8] is not None and record_checksum(row[7]) != row[8]:
+                skipped += 1
+                continue
+
+            fresh.execute(
+                "INSERT OR REPLACE INTO compounds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+            kept += 1
+
+        for table in ("meta", "synonyms", "cas_cids"):
+            try:
+                rows = source.execute(f"SELECT * FROM {table}").fetchall()
+                placeholders = ", ".join("?" * (len(rows[0]) if rows else 1))
+                fresh.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows)
+            except sqlite3.DatabaseError:
+                pass   # lose only this table's rows; compounds are already saved
+
+        return kept, skipped
@@ -0,0 +1,33 @@
+"""CAS Registry Numbers: recognition and check-digit validation."""
+import re
+
+CAS_PATTERN = re.compile(r"^(\d{2,7})-(\d{2})-(\d)$")
+
+
+def looks_like_cas(text):
+    """True for anything shaped like a CAS number, whether or not its check digit is right."""
+    return bool(CAS_PATTERN.match((text or "").strip()))
+
+
+def cas_check_digit(digits):
+    """Check digit for the leading digits of a CAS number (all but the last digit)."""
+    return sum(position * int(d) for position, d in enumerate(reversed(digits), start=1)) % 10
+
+
+def is_valid_cas(text):
+    match = CAS_PATTERN.match((text or "").strip())
+    if not match:
+        return False
+
+    body = match.group(1) + match.group(2)
+    return cas_check_digit(body) == int(match.group(3))
+
+
+def normalize_cas(text):
+    """Canonical form of a valid CAS number (leading zeros dropped), or None."""
+    text = (text or "").strip()
+    if not is_valid_cas(text):
+        return None
+
+    first, second, check = text.split("-")
+    return f"{int(first)}-{second}-{check}"
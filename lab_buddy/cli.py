@@ -0,0 +1,241 @@
+"""Command line front end: ``python -m lab_buddy``."""
+import argparse
+import csv
+import datetime
+import json
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+from lab_buddy import bulk, bundle, workbook
+from lab_buddy.core import CACHE_TTL, LabBuddy
+
+CSV_FIELDS = [
+    "name", "cid", "cas", "formula", "mw", "mw_u", "dens", "dens_u",
+    "iupac", "smiles", "ghs", "image", "source",
+]
+
+
+def compound_row(compound):
+    data = compound.to_dict()
+    data["ghs"] = "; ".join(data["ghs"])
+    return {field: data.get(field) for field in CSV_FIELDS}
+
+
+def write_output(records, fmt, out=sys.stdout):
+    if fmt == "json":
+        json.dump(records, out, indent=2, ensure_ascii=False)
+        out.write("\n")
+        return
+
+    fields = list(records[0].keys()) if records else CSV_FIELDS
+    writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(records)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m lab_buddy",
+        description="Look up chemicals on PubChem without the LAB Buddy window."
+    )
+    parser.add_argument("-f", "--format", choices=("json", "csv"), default="json")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print progress to stderr")
+    parser.add_argument(
+        "--ttl", type=float, default=CACHE_TTL / 86400,
+        help="days before a cached record is refreshed (default: %(default)g)"
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="look up one or more names, CAS numbers or SMILES")
+    search.add_argument("queries", nargs="+")
+    search.add_argument("--offline", action="store_true", help="answer from the local cache only")
+
+    batch = commands.add_parser("batch", help="resolve a CSV/XLSX list of names or CAS numbers")
+    batch.add_argument("file")
+    batch.add_argument("--excel", help="append the results to this LAB Buddy Excel log")
+    batch.add_argument("--no-density", action="store_true", help="skip the per-compound PUG-View lookup (density and hazards)")
+
+    cache = commands.add_parser("cache", help="query the local cache")
+    cache.add_argument("queries", nargs="+")
+
+    export = commands.add_parser("export", help="write the whole local cache to .xlsx, .csv or .jsonl")
+    export.add_argument("file")
+    export.add_argument(
+        "--columns",
+        help=f"comma-separated columns out of: {', '.join(workbook.COLUMNS)} "
+             "(default: the columns of a new Excel log)"
+    )
+
+    seed = commands.add_parser("import", help="seed the local cache from PubChem bulk extract files")
+    seed.add_argument("files", nargs="+", help="CID-Title, CID-Synonym-filtered, CID-SMILES, ... (.gz is fine)")
+    seed.add_argument("--kind", choices=bulk.KINDS, help="extract kind, if the file name does not say")
+    seed.add_argument("--cids", help="only import the CIDs listed in this file, one per line")
+    seed.add_argument("--restart", action="store_true", help="ignore progress saved by an interrupted import")
+
+    share = commands.add_parser("bundle", help="export or merge a signed cache bundle for another workstation")
+    share.add_argument("action", choices=("export", "merge"))
+    share.add_argument("file")
+    share.add_argument(
+        "--since", type=datetime.date.fromisoformat,
+        help="export only records updated on or after this date (YYYY-MM-DD)"
+    )
+    share.add_argument("--key", help=f"shared signing key (default: ${bundle.BUNDLE_KEY_ENV})")
+
+    bench = commands.add_parser("startup-benchmark", help="time cold starts of the LAB Buddy window")
+    bench.add_argument("--runs", type=int, default=5)
+
+    return parser
+
+
+def startup_benchmark(runs):
+    """Launch the Tk app ``runs`` times; one record of timings (ms) per start.
+
+    ``wall_ms`` is measured from process launch, so it includes interpreter
+    startup; ``first_paint_ms`` and ``ready_ms`` are reported by the app itself.
+    """
+    records = []
+
+    for run in range(1, runs + 1):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-m", "lab_buddy.main", "--startup-benchmark"],
+            capture_output=True, text=True
+        )
+        wall = (time.perf_counter() - started) * 1000
+
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not lines:
+            raise RuntimeError(proc.stderr.strip() or f"app exited with {proc.returncode}")
+
+        timings = json.loads(lines[-1])
+        records.append({
+            "run": run,
+            "wall_ms": round(wall, 1),
+            "first_paint_ms": timings["first_paint_ms"],
+            "ready_ms": timings["ready_ms"],
+            "heavy_modules": " ".join(timings["heavy_modules"]),
+        })
+
+    return records
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    log = (lambda message: print(message, file=sys.stderr)) if args.verbose else None
+
+    if args.command == "startup-benchmark":
+        try:
+            records = startup_benchmark(args.runs)
+        except RuntimeError as e:
+            print(f"Startup benchmark failed:\n{e}", file=sys.stderr)
+            return 1
+
+        write_output(records, args.format)
+        paints = [r["first_paint_ms"] for r in records]
+        print(f"first paint: median {statistics.median(paints):.0f} ms, best {min(paints):.0f} ms", file=sys.stderr)
+        return 0
+
+    engine = LabBuddy(log=log, cache_ttl=args.ttl * 86400)
+    try:
+        engine.load_cache()
+    except sqlite3.Error as e:
+        if args.command not in ("search", "batch"):
+            engine.close()
+            print(f"Cache could not be opened: {e}", file=sys.stderr)
+            return 1
+        print(f"Cache could not be opened ({e}); searching PubChem directly", file=sys.stderr)
+
+    try:
+        if args.command == "search":
+            online = False if args.offline else None
+            found = [engine.lookup(query, online=online) for query in args.queries]
+            write_output([compound_row(c) for c in found if c], args.format)
+            for query, compound in zip(args.queries, found):
+                suggestions = [] if compound else engine.suggest_cached(query)
+                if suggestions:
+                    print(f"{query}: not found; did you mean {', '.join(suggestions)}?", file=sys.stderr)
+            return 0 if all(found) else 1
+
+        if args.command == "cache":
+            found = [engine.cache.get(query) for query in args.queries]
+            write_output([compound_row(c) for c in found if c], args.format)
+            return 0 if all(found) else 1
+
+        if args.command == "export":
+            columns = dict(workbook.DEFAULT_COLUMNS)
+            if args.columns:
+                chosen = {c.strip() for c in args.columns.split(",") if c.strip()}
+                unknown = chosen - set(workbook.COLUMNS)
+                if unknown:
+                    print(f"Unknown column(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+                    return 2
+                columns = {key: key in chosen for key in workbook.COLUMNS}
+
+            count = workbook.export_compounds(args.file, engine.cache.iter_compounds(), columns)
+            print(f"{count} compound(s) written to {args.file}", file=sys.stderr)
+            return 0
+
+        if args.command == "import":
+            cids = bulk.read_cid_list(args.cids) if args.cids else None
+            progress = lambda message: print(message, file=sys.stderr)
+            records = []
+            for file_path in args.files:
+                try:
+                    records.append(bulk.import_extract(
+                        engine.cache, file_path, kind=args.kind, cids=cids,
+                        restart=args.restart, log=progress
+                    ))
+                except (OSError, ValueError) as e:
+                    print(f"{file_path}: {e}", file=sys.stderr)
+                    return 1
+
+            write_output(records, args.format)
+            return 0
+
+        if args.command == "bundle":
+            if args.action == "export":
+                since = int(time.mktime(args.since.timetuple())) if args.since else 0
+                count = bundle.export_bundle(engine.cache, args.file, since=since, key=args.key)
+                print(f"{count} record(s) written to {args.file}", file=sys.stderr)
+                return 0
+
+            try:
+                counts = bundle.merge_bundle(
+                    engine.cache, args.file, key=args.key,
+                    log=lambda message: print(message, file=sys.stderr)
+                )
+            except (OSError, bundle.BundleError) as e:
+                print(f"{args.file}: {e}", file=sys.stderr)
+                return 1
+
+            write_output([dict(file=args.file, **counts)], args.format)
+            return 0
+
+        if args.command == "batch":
+            names = workbook.read_name_list(args.file)
+            results = engine.fetch_many(names, with_density=not args.no_density)
+            compounds = [r.compound for r in results if r.compound]
+
+            if args.excel:
+                workbook.append_compounds(args.excel, compounds, workbook.detect_columns(args.excel))
+
+            records = []
+            for result in results:
+                row = {"row": result.row, "query": result.query, "status": result.status}
+                if result.compound:
+                    row.update(compound_row(result.compound))
+                else:
+                    row.update(dict.fromkeys(CSV_FIELDS))
+                records.append(row)
+
+            write_output(records, args.format)
+            return 0 if len(compounds) == len(results) else 1
+
+    finally:
+        engine.close()
+
+    return 2
@@ -0,0 +1,97 @@
+import re
+from dataclasses import dataclass, field, asdict
+
+from lab_buddy.pubchem import NOT_AVAILABLE
+
+
+def normalize_key(name: str) -> str:
+    return re.sub(r"\s+", " ", name.strip().lower())
+
+
+@dataclass
+class Compound:
+    """Plain result object for one looked-up compound.
+
+    ``to_cache``/``from_cache`` convert to and from the compact record layout
+    stored in the local cache. Synonyms are kept in their own cache table.
+    Downloaded image bytes travel along with the result but are never
+    cached or exported.
+    """
+
+    name: str
+    cid: int | None = None
+    cas: str = NOT_AVAILABLE
+    formula: str = NOT_AVAILABLE
+    mw: float | None = None
+    mw_u: str = "g/mol"
+    dens: float | None = None
+    dens_u: str | None = None
+    iupac: str = NOT_AVAILABLE
+    smiles: str = NOT_AVAILABLE
+    ghs: list = field(default_factory=list)
+    pictograms: list = field(default_factory=list)
+    image: str | None = None
+    ts: int = 0
+    source: str = "pubchem"
+    synonyms: list = field(default_factory=list, repr=False)
+
+    image_data: bytes | None = field(default=None, repr=False, compare=False)
+    image_thumb: bytes | None = field(default=None, repr=False, compare=False)
+    pictogram_data: dict = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def key(self):
+        return normalize_key(self.name)
+
+    def to_cache(self):
+        return {
+            "cid": self.cid,
+            "name": self.name,
+            "cas": self.cas,
+            "formula": self.formula,
+            "mw": self.mw,
+            "mw_u": self.mw_u,
+            "dens": self.dens,
+            "dens_u": self.dens_u,
+            "iupac": self.iupac,
+            "smiles": self.smiles,
+            "ghs": self.ghs[:5],
+            "pics": [{"url": p["url"], "label": p["label"]} for p in self.pictograms],
+            "img": self.image,
+            "ts": self.ts,
+        }
+
+    @classmethod
+    def from_cache(cls, data):
+        return cls(
+            name=data.get("name", ""),
+            cid=data.get("cid"),
+            cas=data.get("cas") or NOT_AVAILABLE,
+            formula=data.get("formula") or NOT_AVAILABLE,
+            mw=data.get("mw"),
+            mw_u=data.get("mw_u") or "g/mol",
+            dens=data.get("dens"),
+            dens_u=data.get("dens_u"),
+            iupac=data.get("iupac") or NOT_AVAILABLE,
+            smiles=data.get("smiles") or NOT_AVAILABLE,
+            ghs=list(data.get("ghs") or []),
+            pictograms=list(data.get("pics") or []),
+            image=data.get("img"),
+            ts=data.get("ts", 0),
+            source="cache",
+        )
+
+    def same_data(self, other):
+        """True if both describe the compound identically, ignoring timestamps."""
+        mine = self.to_cache()
+        theirs = other.to_cache()
+        mine.pop("ts")
+        theirs.pop("ts")
+        return mine == theirs
+
+    def to_dict(self):
+        data = asdict(self)
+        data.pop("image_data")
+        data.pop("image_thumb")
+        data.pop("pictogram_data")
+        return data
@@ -0,0 +1,712 @@
+import itertools
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from dataclasses import dataclass, replace
+
+from lab_buddy import pubchem
+from lab_buddy.autocomplete import Autocompleter
+from lab_buddy.cas import is_valid_cas, looks_like_cas, normalize_cas
+from lab_buddy.cache import CompoundCache, known
+from lab_buddy.compound import Compound
+from lab_buddy.images import ImageStore
+from lab_buddy.pictograms import PictogramStore, pictogram_code
+from lab_buddy.pubchem import FETCH_WORKERS, NOT_AVAILABLE, PubChemClient
+
+SEARCH_DEADLINE = 20     # seconds before unfinished requests are given up
+CACHE_TTL = 30 * 24 * 3600   # seconds before a cached record is refreshed in the background
+CACHE_WAIT = 5           # seconds a lookup waits for a cache still loading before going online
+CANCEL_POLL = 0.1        # seconds between cancellation checks while waiting on PubChem
+CACHE_POLL = 2           # seconds between checks for cache rows written by other processes
+
+
+@dataclass
+class BatchResult:
+    row: int
+    query: str
+    status: str
+    cid: int | None = None
+    compound: Compound | None = None
+
+
+def keep_known(fresh, cached):
+    """``fresh`` with every field it came back without taken from ``cached``.
+
+    A ``fresh`` with ``ts`` 0 is missing its PUG-View record, so its hazards
+    and timestamp are not to be trusted either.
+    """
+    updates = {}
+
+    for name in ("cas", "formula", "iupac", "smiles"):
+        if not known(getattr(fresh, name)) and known(getattr(cached, name)):
+            updates[name] = getattr(cached, name)
+    if fresh.mw is None and cached.mw is not None:
+        updates.update(mw=cached.mw, mw_u=cached.mw_u)
+    if fresh.dens is None and cached.dens is not None:
+        updates.update(dens=cached.dens, dens_u=cached.dens_u)
+    if not fresh.ts:
+        updates.update(name=cached.name, ghs=cached.ghs, pictograms=cached.pictograms, ts=cached.ts)
+
+    return replace(fresh, **updates) if updates else fresh
+
+
+class SearchCancelled(Exception):
+    """Raised inside a lookup whose ``SearchJob`` was cancelled."""
+
+
+class SearchJob:
+    """Handle for one lookup, so a newer search can supersede it.
+
+    ``cancel`` drops the job's PubChem requests that have not started yet
+    and makes the lookup raise ``SearchCancelled`` at its next wait.
+    Requests already on the wire run to completion on the pool, but
+    nothing waits for them.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self._ids)
+        self.futures = []
+        self.lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        with self.lock:
+            for future in self.futures:
+                future.cancel()
+
+    def check(self):
+        if self.cancelled:
+            raise SearchCancelled(self.id)
+
+    def track(self, future):
+        with self.lock:
+            self.futures.append(future)
+        if self.cancelled:
+            future.cancel()
+        return future
+
+    def wait(self, futures, deadline):
+        """Wait for ``futures`` until ``deadline``, raising ``SearchCancelled`` as soon as cancelled."""
+        while True:
+            self.check()
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            if not wait(futures, timeout=min(CANCEL_POLL, remaining)).not_done:
+                return
+
+
+class LabBuddy:
+    """UI-free lookup engine shared by the Tk app and the command line.
+
+    Every method returns plain ``Compound`` objects. Progress messages go to
+    the ``log`` callback, which defaults to discarding them.
+    """
+
+    def __init__(self, cache=None, client=None, workers=FETCH_WORKERS, log=None, cache_ttl=CACHE_TTL, images=None):
+        self.cache = cache if cache is not None else CompoundCache()
+        self.images = images if images is not None else ImageStore()
+        self.cache_ttl = cache_ttl
+        self.client = client or PubChemClient(pool_size=workers)
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="pubchem"
+        )
+        self.autocomplete = Autocompleter(self.client)
+        self.pictograms = PictogramStore(self.client)
+        self.log = log or (lambda message: None)
+        self.cache_ready = threading.Event()
+        self.cache_open = False   # stays False if loading failed: lookups then skip the cache
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.autocomplete.close()
+        self.client.close()
+        self.cache.close()
+        self.images.close()
+
+    def load_cache(self, upkeep=False):
+        """Open the cache. Returns False if an unreadable database was set aside.
+
+        Raises ``sqlite3.Error`` if it cannot be opened at all (locked or
+        inaccessible); lookups then search PubChem without it.
+
+        With ``upkeep`` the cache is then checked and compacted, missing
+        pictograms are downloaded, and rows other processes add are indexed,
+        on background threads. Only long-running clients such as the window
+        ask for this; one-shot CLI runs would close the cache underneath them.
+        """
+        started = time.time()
+
+        try:
+            healthy = self.cache.load()
+            self.cache_open = True
+        except sqlite3.Error as e:
+            self.log(f"✗ Cache could not be opened: {e} — searching PubChem directly")
+            raise
+        finally:
+            self.cache_ready.set()
+
+        if healthy:
+            self.log(f"✓ Cache loaded ({len(self.cache)} compounds, {time.time() - started:.2f} s)")
+        else:
+            self.log("⚠ Cache database unreadable — set aside, starting fresh")
+
+        if upkeep:
+            threading.Thread(target=self.maintain_cache, daemon=True).start()
+            threading.Thread(target=self.pictograms.preload, daemon=True).start()
+            threading.Thread(target=self.watch_cache, daemon=True).start()
+
+        return healthy
+
+    def load_cache_async(self, upkeep=False):
+        """Open the cache on a background thread; ``cache_ready`` is set once loading has ended."""
+        threading.Thread(target=self.load_cache, args=(upkeep,), daemon=True).start()
+
+    def wait_ready(self, timeout=None):
+        """Block until the cache is loaded. Returns False if ``timeout`` ran out first."""
+        return self.cache_ready.wait(timeout)
+
+    def cache_usable(self, timeout=0):
+        """True once the cache is loaded; False while it is loading or if it could not be opened."""
+        return self.wait_ready(timeout) and self.cache_open
+
+    def maintain_cache(self):
+        try:
+            outcome = self.cache.maintain()
+        except Exception as e:
+            self.log(f"⚠ Cache maintenance failed: {e}")
+            return
+
+        if outcome:
+            self.log(f"✓ Cache {outcome}")
+
+    def watch_cache(self):
+        """Keep the suggestion indices current with other processes' writes, off the UI thread."""
+        while not self.closed.wait(CACHE_POLL):
+            try:
+                self.cache.refresh()
+            except Exception as e:
+                self.log(f"⚠ Cache refresh failed: {e}")
+
+    def is_online(self):
+        return self.client.is_online()
+
+    def submit(self, search_job, fn, *args):
+        """Queue ``fn`` on the worker pool, tied to ``search_job`` (if any) for cancellation."""
+        future = self.executor.submit(fn, *args)
+        return search_job.track(future) if search_job is not None else future
+
+    def wait_all(self, futures, deadline, search_job=None):
+        if search_job is not None:
+            search_job.wait(futures, deadline)
+        else:
+            wait(futures, timeout=max(0, deadline - time.time()))
+
+    def job_result(self, job, deadline, default=None, label=None, raise_unreachable=False):
+        """Return a pool job's result, or ``default`` if it failed or missed the deadline.
+
+        With ``raise_unreachable``, connection failures are re-raised instead,
+        so the caller can fall back to the cache.
+        """
+        try:
+            return job.result(timeout=max(0, deadline - time.time()))
+        except FutureTimeout:
+            if label:
+                self.log(f"⚠ {label} timed out")
+            return default
+        except Exception as e:
+            if raise_unreachable and pubchem.is_unreachable(e):
+                raise
+            if label:
+                self.log(f"⚠ {label} error: {e}")
+            return default
+
+    # ================= LOOKUPS =================
+
+    def lookup(self, query, online=None, images=False, on_update=None, search_job=None):
+        """Resolve a name, CAS number, IUPAC name or SMILES to a ``Compound``.
+
+        Cached records are returned straight away. Records older than
+        ``cache_ttl`` are refreshed in the background, and ``on_update`` is
+        called with the new ``Compound`` if PubChem's data changed; without
+        ``on_update`` they are refreshed before the lookup returns. Cache
+        misses are fetched from PubChem unless ``online`` is False, or
+        ``online`` is None and PubChem has recently been unreachable; an
+        offline miss logs the closest cached names as suggestions but never
+        substitutes one of them.
+        While the cache is still loading, a lookup waits up to
+        ``CACHE_WAIT`` seconds for it and then falls back to PubChem.
+        Returns None if nothing matches, and raises ``SearchCancelled`` if
+        ``search_job`` is cancelled first.
+        """
+        query = query.strip()
+        compound = None
+
+        if looks_like_cas(query):
+            if not is_valid_cas(query):
+                self.log(f"✗ {query} is not a valid CAS number (check digit)")
+                return None
+            query = normalize_cas(query)
+
+        # Known-offline turns into a cache-only lookup without waiting on timeouts
+        if online is None and not self.client.connectivity.available():
+            online = False
+
+        ready = self.wait_ready(CACHE_WAIT)
+        if ready and self.cache_open:
+            compound = self.cache.get(query)
+            if compound is None and is_valid_cas(query):
+                # Resolved before, possibly cached under a different CAS number of the same CID
+                cid = self.cache.cid_for_cas(query)
+                compound = self.cache.get_by_cid(cid) if cid else None
+        elif not ready and online is not False:
+            self.log("⏳ Cache still loading — searching PubChem")
+
+        if compound is not None:
+            self.log("✓ Loaded from local cache")
+
+            if online is not False and self.is_stale(compound):
+                if on_update is None:
+                    # Nobody to tell about a later update (CLI, scripts): refresh before answering
+                    self.log("↻ Cached record is outdated — refreshing")
+                    compound = self.revalidate(compound) or compound
+                else:
+                    self.log("↻ Cached record is outdated — refreshing in background")
+                    # Own thread: revalidate fans out onto the pool itself
+                    threading.Thread(
+                        target=self.revalidate,
+                        args=(compound, images, on_update),
+                        daemon=True
+                    ).start()
+
+            if images:
+                self.load_images(compound, online=online is not False, search_job=search_job)
+
+            return compound
+
+        if online is False:
+            self.log("✗ Offline and not in local cache")
+            suggestions = self.suggest_cached(query)
+            if suggestions:
+                self.log(f"? Did you mean: {', '.join(suggestions)}")
+            return None
+
+        try:
+            return self.fetch_compound(query, images=images, search_job=search_job)
+        except Exception as e:
+            if not pubchem.is_unreachable(e):
+                raise
+
+        self.log("⚠ PubChem unreachable — searching the local cache only")
+        return self.lookup(query, online=False, images=images, search_job=search_job)
+
+    def suggest_cached(self, query, limit=3):
+        """Cached names closest to ``query``, best first, for "did you mean" hints.
+
+        Similar names are often different chemicals (methanol/ethanol,
+        1-/2-propanol), so these are only ever offered, never looked up in
+        the query's place.
+        """
+        if not self.cache_usable():
+            return []
+        return [name for name, _ in self.cache.closest(query, limit=limit)]
+
+    def is_stale(self, compound):
+        return time.time() - (compound.ts or 0) > self.cache_ttl
+
+    def revalidate(self, cached, images=False, on_update=None):
+        """Re-fetch a cached compound and store it. Returns the fresh ``Compound`` if it changed.
+
+        Fields PubChem did not return this time keep their cached values.
+        """
+        try:
+            fresh = self.fetch_cid(
+                cached.cid,
+                fallback_name=cached.name,
+                formula=cached.formula,
+                images=images and on_update is not None,
+                verbose=False
+            )
+        except Exception as e:
+            self.log(f"⚠ Refresh failed: {e}")
+            return None
+
+        complete = bool(fresh.ts)
+        fresh = keep_known(fresh, cached)
+        changed = not fresh.same_data(cached)
+
+        if not complete:
+            if images and on_update is not None:
+                self.attach_pictograms(fresh)
+            if not changed:
+                return None   # nothing learned: left stale, so the next lookup tries again
+
+        self.cache.add(fresh)
+        try:
+            self.cache.save()
+        except Exception:
+            self.log("⚠ Failed to save cache")
+            return None
+
+        if not changed:
+            return None
+
+        if on_update is not None:
+            on_update(fresh)
+
+        return fresh
+
+    def load_images(self, compound, retries=0, online=True, search_job=None):
+        """Fetch the structure image and pictograms of a cached compound.
+
+        The structure image comes from the local image store when possible;
+        with ``online`` False nothing is downloaded.
+        """
+        deadline = time.time() + SEARCH_DEADLINE
+        image_job = None
+
+        if compound.image:
+            image_job = self.submit(search_job, self.structure_image, compound.image, retries, online)
+
+        self.attach_pictograms(compound, online)
+
+        if image_job is not None:
+            self.wait_all([image_job], deadline, search_job)
+            self.attach_image(compound, self.job_result(image_job, deadline))
+
+    def attach_pictograms(self, compound, online=True):
+        """Fill ``pictogram_data`` from the pictogram store (downloads happen once per pictogram, ever).
+
+        A pictogram that cannot be downloaded is left out; it never fails the lookup.
+        """
+        for pic in compound.pictograms:
+            code = pictogram_code(pic['url'])
+            try:
+                data = self.pictograms.get(code, online) if code else None
+            except Exception as e:
+                self.log(f"⚠ Pictogram {code} unavailable: {e}")
+                data = None
+            if data:
+                compound.pictogram_data[pic['url']] = data
+
+    def structure_image(self, url, retries=None, online=True):
+        """Structure PNG from the image store, downloaded and stored on a miss."""
+        data = self.images.get(url)
+
+        if data is None and online:
+            data = self.client.image_bytes(url, "image", retries)
+            if data:
+                self.images.put(url, data)
+
+        return data
+
+    def attach_image(self, compound, data):
+        compound.image_data = data
+        if data:
+            compound.image_thumb = self.images.thumbnail(compound.image)
+
+    def fetch_compound(self, query, images=False, store=True, search_job=None):
+        """Fetch ``query`` from PubChem; a valid CAS number is resolved to its CID first."""
+        cid = self.cas_cid(query, search_job) if is_valid_cas(query) else None
+        formula = NOT_AVAILABLE
+
+        if cid is None:
+            # Names, SMILES, and CAS numbers the RN cross-reference does not know
+            search_data = self.pooled(search_job, "Search", self.client.search_name, query)
+
+            if search_data is None:
+                self.log(f"✗ Chemical not found")
+                return None
+
+            cid = search_data['PC_Compounds'][0]['id']['id']['cid']
+            formula = pubchem.compound_formula(search_data)
+
+        self.log(f"✓ CID: {cid}")
+
+        compound = self.fetch_cid(
+            cid,
+            fallback_name=query,
+            formula=formula,
+            images=images,
+            search_job=search_job
+        )
+
+        if store and self.cache_usable() and compound.key not in self.cache:
+            self.cache.add(compound)
+            try:
+                self.cache.save()
+                self.log("✓ Cached locally")
+            except Exception:
+                self.log("⚠ Failed to save cache")
+
+        return compound
+
+    def pooled(self, search_job, label, fn, *args):
+        """Run one PubChem call, on the pool when tied to ``search_job`` so it can be cancelled.
+
+        Returns None if it failed or missed ``SEARCH_DEADLINE``; connection
+        failures are raised so ``lookup`` can fall back to the cache.
+        """
+        if search_job is None:
+            return fn(*args)
+
+        deadline = time.time() + SEARCH_DEADLINE
+        job = self.submit(search_job, fn, *args)
+        self.wait_all([job], deadline, search_job)
+        return self.job_result(job, deadline, label=label, raise_unreachable=True)
+
+    def cas_cid(self, cas, search_job=None):
+        """CID of a valid, normalized CAS number: local CAS index, then PubChem's RN cross-reference."""
+        if self.cache_usable():
+            cid = self.cache.cid_for_cas(cas)
+            if cid:
+                return cid
+
+        resolved = self.pooled(search_job, "CAS lookup", self.client.cids_by_cas, [cas])
+        cid = resolved[0].get(cas) if resolved else None
+
+        if cid and self.cache_usable():
+            self.cache.remember_cas({cas: cid})
+            try:
+                self.cache.save()
+            except Exception:
+                self.log("⚠ Failed to save cache")
+
+        return cid
+
+    def fetch_cid(self, cid, fallback_name=None, formula=NOT_AVAILABLE, images=False, verbose=True,
+                  search_job=None):
+        image_url = pubchem.structure_image_url(cid)
+        deadline = time.time() + SEARCH_DEADLINE
+
+        # Independent PubChem calls run side by side on the worker pool
+        record_job = self.submit(search_job, self.client.compound_record, cid)
+        mw_job = self.submit(search_job, self.client.molecular_weight, cid)
+        synonyms_job = self.submit(search_job, self.client.synonyms, cid)
+        jobs = [mw_job, synonyms_job]
+
+        image_job = None
+        if images:
+            image_job = self.submit(search_job, self.structure_image, image_url)
+            jobs.append(image_job)
+
+        self.wait_all([record_job], deadline, search_job)
+        record = self.job_result(record_job, deadline, label="Record")
+        pictograms, hazard_statements = pubchem.record_ghs_data(record)
+
+        self.wait_all(jobs, deadline, search_job)
+
+        molecular_weight_value, molecular_weight_unit = self.job_result(mw_job, deadline, (None, None), "MWT")
+        synonyms = self.job_result(synonyms_job, deadline, [], "Synonyms")
+        density_value, density_unit = pubchem.record_density(record)
+
+        compound = Compound(
+            name=pubchem.record_title(record) or fallback_name or str(cid),
+            cid=cid,
+            cas=pubchem.pick_cas_number(synonyms),
+            formula=formula if formula != NOT_AVAILABLE else pubchem.record_formula(record),
+            mw=molecular_weight_value,
+            mw_u="g/mol",
+            dens=density_value,
+            dens_u=density_unit,
+            iupac=pubchem.record_iupac_name(record),
+            smiles=pubchem.record_smiles(record),
+            ghs=hazard_statements,
+            pictograms=pictograms,
+            image=image_url,
+            # A record that timed out leaves hazards and density unknown: due for a refresh at once
+            ts=int(time.time()) if record else 0,
+            synonyms=synonyms,
+        )
+
+        if image_job is not None:
+            self.attach_image(compound, self.job_result(image_job, deadline))
+
+        if images:
+            self.attach_pictograms(compound)
+
+        if verbose:
+            if density_value is not None:
+                self.log(f"✓ Density: {density_value} {density_unit}")
+            self.log(f"✓ Formula: {compound.formula}")
+            self.log(f"✓ Mol.Weight: {compound.mw} {molecular_weight_unit}")
+            self.log(f"✓ CAS: {compound.cas}")
+
+        return compound
+
+    def refresh(self, key):
+        """Fill in missing SMILES/GHS fields of a cached record. Returns True if it changed."""
+        data = self.cache.get_data(key)
+        cid = data["cid"]
+        updated = False
+
+        if data.get("smiles") and data.get("ghs"):
+            return False
+
+        record = self.client.compound_record(cid)
+
+        if not data.get("smiles"):
+            data["smiles"] = pubchem.record_smiles(record)
+            updated = True
+
+        if not data.get("ghs"):
+            pictograms, hazards = pubchem.record_ghs_data(record)
+            data["ghs"] = hazards[:5]
+            data["pics"] = pictograms
+            updated = True
+
+        if updated:
+            self.cache.put(key, data)
+            self.cache.save()
+
+        return updated
+
+    # ================= BATCH =================
+
+    def fetch_many(self, queries, with_density=True, store=True):
+        """Resolve a list of names/CAS numbers using bulk PubChem requests.
+
+        CAS numbers are checked, then resolved from the local CAS index or in
+        bulk through PubChem's RN cross-reference. Names (and CAS numbers
+        PubChem has no cross-reference for) are resolved concurrently.
+        Properties and synonyms come from the comma-separated POST
+        endpoints, and PUG-View is only consulted for density and hazards
+        when ``with_density`` is set. Records without those are cached with
+        ``ts`` 0, so the next lookup refreshes them. Returns one
+        ``BatchResult`` per query, in order.
+        """
+        cas_cids, synonyms = self.resolve_cas(
+            {normalize_cas(q) for q in queries if is_valid_cas(q)}
+        )
+
+        resolve_jobs = {}
+        for query in queries:
+            if query in resolve_jobs or normalize_cas(query) in cas_cids:
+                continue
+            if looks_like_cas(query) and not is_valid_cas(query):
+                continue
+            resolve_jobs[query] = self.executor.submit(self.client.resolve_cid, query)
+
+        results = []
+
+        for idx, query in enumerate(queries, 1):
+            cid = cas_cids.get(normalize_cas(query))
+            status = "ok"
+
+            if looks_like_cas(query) and not is_valid_cas(query):
+                status = "invalid CAS"
+            elif cid is None:
+                try:
+                    cid = resolve_jobs[query].result()
+                except Exception:
+                    cid = None
+                status = "ok" if cid else "not found"
+
+            results.append(BatchResult(idx, query, status, cid))
+
+            if idx % 25 == 0 or idx == len(queries):
+                self.log(f"… resolved {idx}/{len(queries)}")
+
+        unique_cids = sorted({r.cid for r in results if r.cid})
+
+        properties = self.client.properties_batch(unique_cids)
+        missing = [cid for cid in unique_cids if cid not in synonyms]
+        synonyms.update(self.client.synonyms_batch(missing) if missing else {})
+
+        records = {}
+        if with_density:
+            record_jobs = {cid: self.executor.submit(self.client.compound_record, cid) for cid in unique_cids}
+            for cid, job in record_jobs.items():
+                try:
+                    records[cid] = job.result()
+                except Exception:
+                    records[cid] = None
+
+        store = store and self.cache_usable(CACHE_WAIT)
+
+        for result in results:
+            prop = properties.get(result.cid) if result.cid else None
+
+            if result.cid and prop is None:
+                result.status = "no properties"
+
+            if result.status != "ok":
+                self.log(f"✗ Row {result.row}: {result.query} — {result.status}")
+                continue
+
+            record = records.get(result.cid)
+            density_value, density_unit = pubchem.record_density(record)
+            pictograms, hazard_statements = pubchem.record_ghs_data(record)
+            molecular_weight = prop.get('MolecularWeight')
+
+            result.compound = Compound(
+                name=prop.get('Title') or result.query,
+                cid=result.cid,
+                cas=pubchem.pick_cas_number(synonyms.get(result.cid, [])),
+                formula=prop.get('MolecularFormula', NOT_AVAILABLE),
+                mw=float(molecular_weight) if molecular_weight else None,
+                dens=density_value,
+                dens_u=density_unit,
+                iupac=prop.get('IUPACName', NOT_AVAILABLE),
+                smiles=prop.get('SMILES') or prop.get('CanonicalSMILES', NOT_AVAILABLE),
+                ghs=hazard_statements,
+                pictograms=pictograms,
+                image=pubchem.structure_image_url(result.cid),
+                # Without the PUG-View record there are no hazards: cache it as due for a refresh
+                ts=int(time.time()) if record else 0,
+                synonyms=synonyms.get(result.cid, []),
+            )
+            self.log(f"✓ Row {result.row}: {result.query} → CID {result.cid}")
+
+            if store and result.compound.key not in self.cache:
+                self.cache.add(result.compound)
+
+        if store:
+            try:
+                self.cache.save()
+            except Exception:
+                self.log("⚠ Failed to save cache")
+
+        return results
+
+    def resolve_cas(self, cas_numbers):
+        """CAS -> CID for valid, normalized CAS numbers: local index first, then one bulk PubChem request.
+
+        Returns ``(cids, synonyms)``; synonyms (by CID) are only known for
+        numbers PubChem resolved.
+        """
+        cids = {}
+        synonyms = {}
+
+        if self.cache_usable():
+            for cas in cas_numbers:
+                cid = self.cache.cid_for_cas(cas)
+                if cid:
+                    cids[cas] = cid
+
+        unknown = sorted(set(cas_numbers) - set(cids))
+        if unknown:
+            try:
+                resolved, synonyms = self.client.cids_by_cas(unknown)
+            except Exception as e:
+                self.log(f"⚠ CAS lookup failed: {e}")
+                resolved = {}
+
+            cids.update(resolved)
+            self.log(f"✓ CAS numbers: {len(cids) - len(resolved)} known, {len(resolved)}/{len(unknown)} resolved")
+
+            if resolved and self.cache_usable():
+                self.cache.remember_cas(resolved)
+
+        return cids, synonyms
@@ -0,0 +1,181 @@
+"""Content-addressed on-disk store for downloaded structure images."""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from io import BytesIO
+
+from lab_buddy.paths import IMAGE_DIR
+
+IMAGE_CACHE_LIMIT = 64 * 1024 * 1024   # bytes of images and thumbnails kept on disk
+THUMBNAIL_SIZE = (500, 320)            # fits the structure panel of the Tk app
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url    TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_digest ON urls (digest);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size   INTEGER NOT NULL,
+    used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_used ON blobs (used);
+"""
+
+
+def make_thumbnail(data, size=THUMBNAIL_SIZE):
+    """PNG bytes of ``data`` scaled down to fit ``size``, or None if it is not an image."""
+    from PIL import Image
+
+    try:
+        img = Image.open(BytesIO(data))
+        img.thumbnail(size)
+        out = BytesIO()
+        img.save(out, format="PNG")
+        return out.getvalue()
+    except Exception:
+        return None
+
+
+class ImageStore:
+    """Structure images kept on disk by the SHA-256 of their content.
+
+    An index database maps source URLs to content digests, so identical
+    images are stored once. Each image is stored alongside a thumbnail
+    pre-sized to ``THUMBNAIL_SIZE``. Once the store grows past ``limit``
+    bytes, the least recently used images are evicted.
+    """
+
+    def __init__(self, root=IMAGE_DIR, limit=IMAGE_CACHE_LIMIT, thumb_size=THUMBNAIL_SIZE):
+        self.root = root
+        self.limit = limit
+        self.thumb_size = thumb_size
+        self.conn = None
+        self.lock = threading.RLock()
+
+    def load(self):
+        with self.lock:
+            if self.conn is None:
+                os.makedirs(self.root, exist_ok=True)
+                self.conn = sqlite3.connect(os.path.join(self.root, "index.db"), check_same_thread=False)
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.executescript(SCHEMA)
+            return self.conn
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def blob_path(self, digest, thumbnail=False):
+        suffix = ".thumb.png" if thumbnail else ".png"
+        return os.path.join(self.root, digest[:2], digest + suffix)
+
+    def digest_for(self, url):
+        """Content digest stored for ``url``, marked as just used, or None."""
+        with self.lock:
+            conn = self.load()
+            row = conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+
+            conn.execute("UPDATE blobs SET used = ? WHERE digest = ?", (time.time(), row[0]))
+            conn.commit()
+
+        return row[0]
+
+    def read(self, url, thumbnail=False):
+        digest = self.digest_for(url) if url else None
+        if digest is None:
+            return None
+
+        try:
+            with open(self.blob_path(digest, thumbnail), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get(self, url):
+        """Stored image bytes for ``url``, or None."""
+        return self.read(url)
+
+    def thumbnail(self, url):
+        """Stored thumbnail bytes for ``url``, or None."""
+        return self.read(url, thumbnail=True)
+
+    def put(self, url, data):
+        """Store ``data`` (and its thumbnail) as the image of ``url``. Returns the digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        size = 0
+
+        if not os.path.exists(path):
+            size += self.write(path, data)
+
+            thumb = make_thumbnail(data, self.thumb_size)
+            if thumb:
+                size += self.write(self.blob_path(digest, thumbnail=True), thumb)
+
+        with self.lock:
+            conn = self.load()
+            conn.execute("INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest))
+            conn.execute(
+                "INSERT INTO blobs (digest, size, used) VALUES (?, ?, ?) "
+                "ON CONFLICT (digest) DO UPDATE SET used = excluded.used, size = size + excluded.size",
+                (digest, size, time.time())
+            )
+            conn.commit()
+
+        self.evict()
+
+        return digest
+
+    def write(self, path, data):
+        """Write atomically, so a crash never leaves a truncated image behind."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        return len(data)
+
+    def size(self):
+        with self.lock:
+            return self.load().execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used images until the store fits ``limit``. Returns how many went."""
+        removed = 0
+
+        with self.lock:
+            conn = self.load()
+            total = self.size()
+
+            if total <= self.limit:
+                return 0
+
+            for digest, size in conn.execute("SELECT digest, size FROM blobs ORDER BY used").fetchall():
+                if total <= self.limit:
+                    break
+
+                for thumbnail in (False, True):
+                    try:
+                        os.remove(self.blob_path(digest, thumbnail))
+                    except OSError:
+                        pass
+
+                conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+                conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                total -= size
+                removed += 1
+
+            conn.commit()
+
+        return removed
@@ -0,0 +1,136 @@
+"""In-memory search indices over the compound cache."""
+import bisect
+import re
+import threading
+from collections import Counter, defaultdict
+
+
+class PrefixIndex:
+    """Sorted (term, name) array answering prefix queries with ``bisect``.
+
+    Terms are already-normalized strings (names, CAS numbers, ...) and each
+    maps to the display name of a cached compound. Lookups cost
+    O(log n + k), inserts keep the array sorted incrementally.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, term, name):
+        if not term:
+            return
+
+        item = (term, name)
+
+        with self.lock:
+            pos = bisect.bisect_left(self.entries, item)
+            if pos == len(self.entries) or self.entries[pos] != item:
+                self.entries.insert(pos, item)
+
+    def build(self, items):
+        """Replace the whole index from an iterable of (term, name) pairs."""
+        entries = sorted({(term, name) for term, name in items if term})
+
+        with self.lock:
+            self.entries = entries
+
+    def search(self, prefix, limit=6):
+        """Up to ``limit`` distinct names having a term that starts with ``prefix``."""
+        results = []
+
+        with self.lock:
+            pos = bisect.bisect_left(self.entries, (prefix,))
+
+            while pos < len(self.entries) and len(results) < limit:
+                term, name = self.entries[pos]
+                if not term.startswith(prefix):
+                    break
+                if name not in results:
+                    results.append(name)
+                pos += 1
+
+        return results
+
+
+def trigrams(term):
+    """Set of letter trigrams, ignoring case, spaces and punctuation.
+
+    "dimethyl sulfoxide" and "Dimethylsulfoxide" produce the same set.
+    """
+    compact = re.sub(r"[^a-z0-9]", "", term.lower())
+    if not compact:
+        return set()
+
+    padded = f"  {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Typo-tolerant lookup of (term, name) pairs by trigram similarity.
+
+    An inverted index maps each trigram to the terms containing it, so a
+    query only scores terms sharing at least one trigram with it. Scores
+    are Dice coefficients between 0 and 1.
+    """
+
+    def __init__(self):
+        self.terms = []        # id -> (name, trigram count)
+        self.ids = {}          # (term, name) -> id
+        self.postings = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, term, name):
+        if not term:
+            return
+
+        grams = trigrams(term)
+        if not grams:
+            return
+
+        with self.lock:
+            if (term, name) in self.ids:
+                return
+
+            term_id = len(self.terms)
+            self.ids[(term, name)] = term_id
+            self.terms.append((name, len(grams)))
+            for gram in grams:
+                self.postings[gram].append(term_id)
+
+    def build(self, items):
+        """Replace the whole index from an iterable of (term, name) pairs."""
+        fresh = TrigramIndex()
+        for term, name in items:
+            fresh.add(term, name)
+
+        with self.lock:
+            self.terms, self.ids, self.postings = fresh.terms, fresh.ids, fresh.postings
+
+    def search(self, query, limit=6, min_score=0.4):
+        """Up to ``limit`` (name, score) pairs, best first, scoring at least ``min_score``."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        hits = Counter()
+        with self.lock:
+            for gram in grams:
+                hits.update(self.postings.get(gram, ()))
+            terms = self.terms
+
+        best = {}
+        for term_id, common in hits.items():
+            name, count = terms[term_id]
+            score = 2 * common / (len(grams) + count)
+            if score >= min_score and score > best.get(name, 0):
+                best[name] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
@@ -1,58 +1,55 @@
+import time
+STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from wsgiref import headers
-import requests
-from PIL import Image, ImageTk, ImageDraw
 from io import BytesIO
-import pandas as pd
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Font, Alignment
 import os
+import queue
 import sys
-import json
 import threading
-import time
 import webbrowser
-import re
-from openpyxl.utils import get_column_letter
-import hashlib
 
-def get_app_data_dir():
-    base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
-    path = os.path.join(base, "LabBuddy", "backend")
-    os.makedirs(path, exist_ok=True)
-    return path
+if __package__ in (None, ""):
+    # Running as ``python lab_buddy/main.py`` (or a frozen build)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lab_buddy import workbook
+from lab_buddy.core import LabBuddy, SearchCancelled, SearchJob
+from lab_buddy.paths import ASSET_DIR, resource_path
+from lab_buddy.pictograms import pictogram_code
 
 SEARCH_PLACEHOLDER = "Use me for search…"
 PLACEHOLDER_COLOR = "gray"
 NORMAL_COLOR = "black"
-APP_DATA_DIR = get_app_data_dir()
-
-CACHE_FILE = os.path.join(APP_DATA_DIR, "chemical_cache.json")
-CACHE_SIG_FILE = os.path.join(APP_DATA_DIR, "chemical_cache.sig")
-
-readme_path = os.path.join(APP_DATA_DIR, "README.txt")
-if not os.path.exists(readme_path):
-    try:
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(
-                "LAB Buddy – Backend Data Folder\n\n"
-                "This folder stores local cache files used by LAB Buddy\n"
-                "to enable offline operation and faster searches.\n\n"
-                "⚠ Do not delete or modify files in this folder.\n"
-                "Deleting it may require LAB Buddy to re-download data.\n"
-            )
-    except:
-        pass
+AUTOCOMPLETE_DELAY = 250   # ms of typing pause before PubChem is asked
+EXCEL_FLUSH_INTERVAL = 5000   # ms between background saves of queued Excel rows
+UI_DRAIN_INTERVAL = 50        # ms between renders of updates queued by worker threads
+HEADER_SIZE = (1600, 70)
+
+# Pillow, openpyxl and requests are imported on first use, not at startup
+HEAVY_MODULES = ("PIL", "openpyxl", "requests")
+
+
+def header_image():
+    """Header banner as a Tk PhotoImage, resized once and kept in ASSET_DIR."""
+    source = resource_path("header_polymer.png")
+    stat = os.stat(source)
+    width, height = HEADER_SIZE
+    cached = os.path.join(ASSET_DIR, f"header_{stat.st_size}_{int(stat.st_mtime)}_{width}x{height}.png")
+
+    if not os.path.exists(cached):
+        from PIL import Image
 
+        os.makedirs(ASSET_DIR, exist_ok=True)
+        img = Image.open(source).resize(HEADER_SIZE, Image.Resampling.LANCZOS)
+        tmp_path = cached + ".tmp"
+        img.save(tmp_path, format="PNG")
+        os.replace(tmp_path, cached)
+
+    # Tk decodes PNG itself, so cached starts never touch Pillow
+    return tk.PhotoImage(file=cached)
 
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and PyInstaller """
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
 
 class PubChemScraperApp:
     def __init__(self, root):
@@ -67,22 +64,25 @@ class PubChemScraperApp:
         except Exception:
             pass
         self.excel_file = None
+        self.excel_session = None
+        self.excel_locked = False
         self.current_data = None
         self.excel_frame_visible = False
         self.suggestion_confirmed = False
         self.suggestion_popup = None
-        self.search_in_progress = False
+        self.search_job = None
         self.header_bg_image = None
         try:
-            img = Image.open(resource_path("header_polymer.png"))
-            img = img.resize((1600, 70), Image.Resampling.LANCZOS)
-            self.header_bg_image = ImageTk.PhotoImage(img)
+            self.header_bg_image = header_image()
         except Exception as e:
             pass
         self.suggestions = []
         self.suggestion_listbox = None
         self.autocomplete_active = False
-        self.last_search_time = 0
+        self.suggest_job = None
+        self.suggest_generation = 0
+        self.pictogram_photos = {}
+        self.ui_queue = queue.SimpleQueue()
         self.last_searched_query = None
 
         self.include_cas = tk.BooleanVar(value=True)
@@ -103,46 +103,36 @@ class PubChemScraperApp:
 
         self.create_widgets()
 
-        self.cache = {}
-
-        try:
-            with open(CACHE_FILE, "rb") as f:
-                raw = f.read()
-
-            with open(CACHE_SIG_FILE, "r") as sig:
-                stored_hash = sig.read().strip()
-
-            if self.compute_hash(raw) != stored_hash:
-                raise ValueError("Cache integrity check failed")
-
-            self.cache = json.loads(raw.decode("utf-8"))
-            self.log("✓ Cache loaded (integrity verified)")
-
-        except Exception:
-            self.cache = {}
-            self.log("⚠ Cache invalid or missing — ignored safely")
-
-        # ✅ ALWAYS build indices (outside except)
-        self.cas_index = {}
-        self.iupac_index = {}
-        self.smiles_index = {}
+        self.engine = LabBuddy(log=self.log)
 
-        for key, data in self.cache.items():
-            if data.get("cas"):
-                self.cas_index[data["cas"].lower()] = key
+        # The cache is opened once the window is on screen
+        self.root.after_idle(self.on_first_paint)
+        self.root.after(UI_DRAIN_INTERVAL, self.drain_ui_queue)
+        self.root.after(EXCEL_FLUSH_INTERVAL, self.autosave_excel)
 
-            if data.get("iupac"):
-                self.iupac_index[self.normalize_key(data["iupac"])] = key
+    def on_first_paint(self):
+        self.first_paint = time.perf_counter() - STARTED
+        self.log(f"✓ Window ready in {self.first_paint * 1000:.0f} ms")
 
-            if data.get("smiles"):
-                self.smiles_index[data["smiles"]] = key
+        # Loads in the background; lookups wait on engine.cache_ready
+        self.engine.load_cache_async(upkeep=True)
 
     def on_close(self):
-        if messagebox.askyesno(
+        if not messagebox.askyesno(
             "Exit LAB Buddy",
             "Any unsaved data will be lost.\n\nDo you want to exit LAB Buddy?"
         ):
-            self.root.destroy()
+            return
+
+        if not self.flush_excel() and not messagebox.askyesno(
+            "Unsaved Rows",
+            f"{self.excel_session.pending} row(s) could not be saved to Excel.\n\n"
+            "Close the Excel file and choose No to keep LAB Buddy open, or Yes to exit anyway."
+        ):
+            return
+
+        self.engine.close()
+        self.root.destroy()
 
     def open_dev_profile(self, event=None):
         webbrowser.open_new(
@@ -150,6 +140,8 @@ class PubChemScraperApp:
         )
     
     def make_circular_image(self, img, size=180, border=6):
+        from PIL import Image, ImageDraw
+
         img = img.resize((size, size), Image.Resampling.LANCZOS).convert("RGBA")
 
         # Create circular mask
@@ -166,18 +158,7 @@ class PubChemScraperApp:
         return background
 
     def cache_suggestions(self, query, limit=6):
-        q = self.normalize_key(query)
-        results = []
-
-        for key, data in self.cache.items():
-            name = self.normalize_key(data.get("name", ""))
-            if name.startswith(q):
-                results.append(data["name"])
-                if len(results) >= limit:
-                    break
-
-        return results
-    
+        return self.engine.cache.suggestions(query, limit)
 
     def create_widgets(self):
 
@@ -583,6 +564,28 @@ class PubChemScraperApp:
         )
         load_btn.pack(side="right", padx=5)
 
+        batch_btn = tk.Button(
+            self.excel_frame,
+            text="Batch Import",
+            command=self.start_batch_import,
+            bg="#E67E22",
+            fg="white",
+            padx=10,
+            pady=5
+        )
+        batch_btn.pack(side="right", padx=5)
+
+        export_btn = tk.Button(
+            self.excel_frame,
+            text="Export Cache",
+            command=self.start_cache_export,
+            bg="#8E44AD",
+            fg="white",
+            padx=10,
+            pady=5
+        )
+        export_btn.pack(side="right", padx=5)
+
         self.excel_frame.pack_forget()
 
         button_frame = tk.Frame(left_frame)
@@ -737,6 +740,8 @@ class PubChemScraperApp:
         left.pack(side="left", padx=(10, 25), pady=10)
 
         try:
+            from PIL import Image, ImageTk
+
             img = Image.open(resource_path("profile.png"))
             circ_img = self.make_circular_image(img, size=180, border=6)
             photo = ImageTk.PhotoImage(circ_img)
@@ -860,7 +865,7 @@ class PubChemScraperApp:
             )
             return
 
-        image_url = self.current_data.get("image")
+        image_url = self.current_data.image
         if not image_url:
             messagebox.showwarning("No Image", "No image available.")
             return
@@ -877,14 +882,15 @@ class PubChemScraperApp:
             )
             return
 
-        image_url = self.current_data.get("image")
+        image_url = self.current_data.image
         if not image_url:
             messagebox.showwarning("No Image", "No image available.")
             return
 
         try:
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
+            image_data = self.current_data.image_data or self.engine.structure_image(image_url)
+            if image_data is None:
+                raise RuntimeError("Image not available offline")
 
             temp_path = os.path.join(
                 os.environ.get("TEMP", "."),
@@ -892,7 +898,7 @@ class PubChemScraperApp:
             )
 
             with open(temp_path, "wb") as f:
-                f.write(response.content)
+                f.write(image_data)
 
             os.startfile(temp_path)  # Windows opens image viewer
             self.log("✓ Structure image opened (source: PubChem)")
@@ -985,16 +991,19 @@ class PubChemScraperApp:
             self.suggestion_confirmed = False
             return
 
-        # Otherwise, run search
-        threading.Thread(
-            target=self.search_chemical,
-            daemon=True
-        ).start()
+        # Otherwise, run search (the lookup itself runs on a worker thread)
+        self.search_chemical()
 
     def on_key_release(self, event):
         if event.keysym in ('Return', 'Up', 'Down', 'Left', 'Right', 'Escape', 'Tab'):
             return
 
+        # Any newer keystroke makes pending PubChem answers stale
+        self.suggest_generation += 1
+        if self.suggest_job:
+            self.root.after_cancel(self.suggest_job)
+            self.suggest_job = None
+
         value = self.name_entry.get().strip()
         if len(value) < 2:
             self.hide_suggestions()
@@ -1005,11 +1014,12 @@ class PubChemScraperApp:
         if cached:
             self.show_suggestions(cached)
         else:
-            threading.Thread(
-                target=self.fetch_suggestions,
-                args=(value,),
-                daemon=True
-            ).start()
+            self.suggest_job = self.root.after(
+                AUTOCOMPLETE_DELAY,
+                self.fetch_suggestions,
+                value,
+                self.suggest_generation
+            )
     
     def open_help_pdf(self):
         try:
@@ -1029,20 +1039,31 @@ class PubChemScraperApp:
             self.root.after(10, lambda: self.left_canvas.yview_moveto(1.0))
         self.excel_frame_visible = not self.excel_frame_visible
 
-    def fetch_suggestions(self, query):
-        try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/autocomplete/compound/{query}/json?limit=10"
-            response = requests.get(url, timeout=3)
+    def fetch_suggestions(self, query, generation):
+        self.suggest_job = None
 
-            if response.status_code == 200:
-                data = response.json()
-                suggestions = []
-                if 'dictionary_terms' in data and 'compound' in data['dictionary_terms']:
-                    suggestions = data['dictionary_terms']['compound'][:10]
+        remembered = self.engine.autocomplete.cached(query)
+        if remembered is not None:
+            self.show_suggestions(remembered)
+            return
 
-                self.root.after(0, self.show_suggestions, suggestions)
-        except:
-            pass
+        future = self.engine.autocomplete.submit(query)
+        future.add_done_callback(
+            lambda f: self.ui(self.deliver_suggestions, f, generation, key="suggestions")
+        )
+
+    def deliver_suggestions(self, future, generation):
+        # Drop answers to queries the user has already typed past
+        if generation != self.suggest_generation or future.cancelled():
+            return
+
+        try:
+            suggestions = future.result()
+        except Exception:
+            return
+
+        if suggestions is not None:
+            self.show_suggestions(suggestions)
 
     def show_suggestions(self, suggestions):
         if not suggestions or not self.name_entry.get().strip():
@@ -1109,10 +1130,51 @@ class PubChemScraperApp:
             self.suggestion_listbox = None
         self.autocomplete_active = False
 
+    # ================= UI DISPATCH =================
+
+    def ui(self, func, *args, key=None):
+        """Run ``func(*args)`` on the Tk thread; safe to call from any thread.
+
+        Calls posted from worker threads are batched by ``drain_ui_queue``.
+        Of several queued calls sharing a ``key`` only the newest runs.
+        """
+        if threading.current_thread() is threading.main_thread():
+            func(*args)
+        else:
+            self.ui_queue.put((key, func, args))
+
+    def drain_ui_queue(self):
+        lines = []
+        calls = {}
+
+        while True:
+            try:
+                key, func, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if func is None:
+                lines.append(args[0])
+            else:
+                calls.pop(key, None)
+                calls[key if key is not None else object()] = (func, args)
+
+        # One insert for every line logged since the last render
+        if lines:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.log_text.see(tk.END)
+
+        for func, args in calls.values():
+            try:
+                func(*args)
+            except Exception as e:
+                self.log_error("UI Error", str(e), f"Type: {type(e).__name__}")
+
+        self.root.after(UI_DRAIN_INTERVAL, self.drain_ui_queue)
+
     def log(self, message):
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.root.update()
+        # Rendered by drain_ui_queue, whichever thread logs
+        self.ui_queue.put((None, None, (message,)))
 
     def log_error(self, error_type, error_message, details=""):
         self.log(f"\n{'='*40}")
@@ -1155,236 +1217,33 @@ class PubChemScraperApp:
         self.hazard_text.delete(1.0, tk.END)
         self.current_data = None
     
-    def fetch_density(self, cid):
-        try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON"
-            response = requests.get(url, timeout=15)
-
-            if response.status_code != 200:
-                return None, None
-
-            data = response.json()
-            sections = data.get("Record", {}).get("Section", [])
-
-            for section in sections:
-                if section.get("TOCHeading") == "Chemical and Physical Properties":
-                    for sub in section.get("Section", []):
-                        if sub.get("TOCHeading") == "Experimental Properties":
-                            for prop in sub.get("Section", []):
-                                if "density" in prop.get("TOCHeading", "").lower():
-                                    for info in prop.get("Information", []):
-                                        value = info.get("Value", {})
-                                        text = ""
-
-                                        if "StringWithMarkup" in value:
-                                            text = value["StringWithMarkup"][0].get("String", "")
-                                        elif "StringValue" in value:
-                                            text = value["StringValue"]
-
-                                        if not text:
-                                            continue
-
-                                        # ---- Extract number ----
-                                        match = re.search(r"([\d.]+)", text)
-                                        if not match:
-                                            continue
-
-                                        density = float(match.group(1))
-
-                                        # ---- Detect temperature ----
-                                        temp_c = 25  # default lab temp
-
-                                        if "°f" in text.lower():
-                                            temp_f_match = re.search(r"([\d.]+)\s*°\s*f", text.lower())
-                                            if temp_f_match:
-                                                temp_f = float(temp_f_match.group(1))
-                                                temp_c = round((temp_f - 32) * 5 / 9)
-
-                                        elif "°c" in text.lower():
-                                            temp_c_match = re.search(r"([\d.]+)\s*°\s*c", text.lower())
-                                            if temp_c_match:
-                                                temp_c = round(float(temp_c_match.group(1)))
-
-                                        return density, f"g/mL @ {temp_c} °C"
-
-
-            return None, None
-
-        except Exception as e:
-            
-            self.log(f"⚠ Density error: {e}")
-            return None, None
-
-    def fetch_iupac_name(self, cid):
-        iupac_name = "Not available"
-        try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON"
-            response = requests.get(url, timeout=15)
-
-            if response.status_code == 200:
-                data = response.json()
-                sections = data.get('Record', {}).get('Section', [])
-
-                for section in sections:
-                    if section.get('TOCHeading') == 'Names and Identifiers':
-                        for subsection in section.get('Section', []):
-                            if subsection.get('TOCHeading') == 'Computed Descriptors':
-                                for info_section in subsection.get('Section', []):
-                                    if info_section.get('TOCHeading') == 'IUPAC Name':
-                                        for info in info_section.get('Information', []):
-                                            value = info.get('Value', {})
-                                            if 'StringWithMarkup' in value:
-                                                markup_list = value['StringWithMarkup']
-                                                if markup_list and len(markup_list) > 0:
-                                                    iupac_name = markup_list[0].get('String', 'Not available')
-                                                    self.log(f"✓ IUPAC Name found")
-                                                    return iupac_name
-                                        break
-                                break
-                        break
-        except Exception as e:
-            
-            self.log(f"⚠ IUPAC: {str(e)}")
-
-        return iupac_name
-
-    def fetch_smiles(self, cid):
-        smiles = "Not available"
-        try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON"
-            response = requests.get(url, timeout=15)
-
-            if response.status_code == 200:
-                data = response.json()
-                sections = data.get('Record', {}).get('Section', [])
-
-                for section in sections:
-                    if section.get('TOCHeading') == 'Names and Identifiers':
-                        for subsection in section.get('Section', []):
-                            if subsection.get('TOCHeading') == 'Computed Descriptors':
-                                for info_section in subsection.get('Section', []):
-                                    if info_section.get('TOCHeading') == 'SMILES':
-                                        for info in info_section.get('Information', []):
-                                            value = info.get('Value', {})
-                                            if 'StringWithMarkup' in value:
-                                                markup_list = value['StringWithMarkup']
-                                                if markup_list and len(markup_list) > 0:
-                                                    smiles = markup_list[0].get('String', 'Not available')
-                                                    self.log(f"✓ SMILES found")
-                                                    return smiles
-                                        break
-                                break
-                        break
-        except Exception as e:
-            
-            self.log(f"⚠ SMILES: {str(e)}")
-
-        return smiles
-
-    def find_ghs_section(self, sections, path=[]):
-        for section in sections:
-            heading = section.get('TOCHeading', '')
-
-            if 'GHS Classification' in heading:
-                return section
-
-            if 'Section' in section:
-                result = self.find_ghs_section(section['Section'], path + [heading])
-                if result:
-                    return result
-
-        return None
-
-    def fetch_ghs_data(self, cid):
-        pictograms = []
-        hazard_statements = []
+    def load_ghs_images(self, compound):
+        images = []
+        labels = []
 
-        try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON"
-            response = requests.get(url, timeout=15)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                sections = data.get('Record', {}).get('Section', [])
-                for section in sections:
-                    if section.get('TOCHeading') == 'Safety and Hazards':
-                        ghs_section = self.find_ghs_section(section.get('Section', []))
-
-                        if ghs_section:
-                            self.log(f"✓ Found GHS section")
-
-                            for info in ghs_section.get('Information', []):
-                                info_name = info.get('Name', '')
-
-                                if info_name == 'Pictogram(s)':
-                                    value = info.get('Value', {})
-                                    string_with_markup = value.get('StringWithMarkup', [])
-                                    for item in string_with_markup:
-                                        if len(pictograms) >= 3:
-                                            break
-                                        markup_list = item.get('Markup', [])
-                                        for markup in markup_list:
-                                            if len(pictograms) >= 3:
-                                                break
-                                            if markup.get('Type') == 'Icon':
-                                                pic_url = markup.get('URL', '')
-                                                pic_label = markup.get('Extra', '')
-                                                if pic_url:
-                                                    pictograms.append({
-                                                        'url': pic_url,
-                                                        'label': pic_label
-                                                    })
-
-                                elif 'GHS Hazard Statement' in info_name or info_name == 'Hazard Statement(s)':
-                                    value = info.get('Value', {})
-
-                                    if 'StringValueList' in value:
-                                        for statement in value['StringValueList']:
-                                            if len(hazard_statements) >= 5:
-                                                break
-                                            hazard_statements.append(statement)
-
-                                    elif 'StringValue' in value:
-                                        if len(hazard_statements) < 5:
-                                            hazard_statements.append(value['StringValue'])
-
-                                    elif 'StringWithMarkup' in value:
-                                        for item in value['StringWithMarkup']:
-                                            if len(hazard_statements) >= 5:
-                                                break
-                                            if 'String' in item:
-                                                hazard_statements.append(item['String'])
-                            break
+        for pic in compound.pictograms:
+            photo = self.pictogram_photo(pic['url'], compound.pictogram_data.get(pic['url']))
+            if photo:
+                images.append(photo)
+                labels.append(pic['label'])
 
-        except Exception as e:
-            
-            pass
-
-        return pictograms, hazard_statements
+        return images, labels
 
-    def load_ghs_images(self, pictograms):
-        images = []
-        labels = []
+    def pictogram_photo(self, url, data):
+        # Nine pictograms in total: decode each once and share the PhotoImage
+        code = pictogram_code(url) or url
+        photo = self.pictogram_photos.get(code)
 
-        for pic in pictograms:
+        if photo is None and data:
             try:
-                url = pic['url']
-                label = pic['label']
-
-                gif_url = url.replace('.svg', '.gif')
-                response = requests.get(gif_url, timeout=5)
-
-                if response.status_code == 200:
-                    img = Image.open(BytesIO(response.content))
-                    img = img.resize((100, 100), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    images.append(photo)
-                    labels.append(label)
-            except:
-                pass
+                from PIL import Image, ImageTk
 
-        return images, labels
+                photo = ImageTk.PhotoImage(Image.open(BytesIO(data)))
+                self.pictogram_photos[code] = photo
+            except Exception:
+                return None
+
+        return photo
 
     def display_ghs_images(self, images, labels):
         for widget in self.hazard_frame.winfo_children():
@@ -1411,96 +1270,16 @@ class PubChemScraperApp:
                                  font=("Arial", 9, "bold"), wraplength=100)
             text_label.pack()
 
+    def selected_columns(self):
+        return {key: getattr(self, f"include_{key}").get() for key in workbook.COLUMNS}
+
     def create_excel_file(self):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
             filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
         )
 
-        if file_path:
-            wb = Workbook()
-            sheet = wb.active
-            sheet.title = "Chemicals"
-
-            headers = ['Sl. No', 'Chemical Name']
-            if self.include_cas.get():
-                headers.append('CAS No.')
-            if self.include_formula.get():
-                headers.append('Molecular Formula')
-            if self.include_molweight.get():
-                headers.append('Molecular Weight')
-                headers.append('SI.Unit')
-            if self.include_density.get():
-                headers.append('Density')
-                headers.append('SI.Unit')
-            if self.include_quantity.get():
-                headers.append('Quantity')
-                headers.append('SI.Unit')
-            if self.include_equivalence.get():
-                headers.append('Equivalence')
-            if self.include_iupac.get():
-                headers.append('IUPAC Name')
-            if self.include_smiles.get():
-                headers.append('SMILES')
-            if self.include_image_link.get():
-                headers.append('Image Link')
-
-
-            for col, header in enumerate(headers, start=1):
-                cell = sheet.cell(row=1, column=col)
-                cell.value = header
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal='center')
-
-            sheet.column_dimensions['A'].width = 10
-            sheet.column_dimensions['B'].width = 30
-            col_idx = 3
-
-            if self.include_cas.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 16
-                col_idx += 1
-
-            if self.include_formula.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 20
-                col_idx += 1
-
-            if self.include_molweight.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 14  # MW
-                col_idx += 1
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 12  # MW SI
-                col_idx += 1
-
-            if self.include_density.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 14  # Density
-                col_idx += 1
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 16  # Density SI
-                col_idx += 1
-
-            if self.include_quantity.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 12  # Quantity
-                col_idx += 1
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 14  # Quantity SI
-                col_idx += 1
-
-            if self.include_equivalence.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 14
-                col_idx += 1
-
-            if self.include_iupac.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 45
-                col_idx += 1
-
-            if self.include_smiles.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 40
-                col_idx += 1
-
-            if self.include_image_link.get():
-                sheet.column_dimensions[get_column_letter(col_idx)].width = 45
-                col_idx += 1
-
-
-            wb.save(file_path)
-            self.excel_file = file_path
+        if file_path and self.open_excel_session(file_path, create=True):
             self.file_label.config(text=os.path.basename(file_path), fg="green")
             self.log(f"✓ Excel created: {os.path.basename(file_path)}")
             messagebox.showinfo("Success", f"Excel created: {os.path.basename(file_path)}")
@@ -1510,39 +1289,63 @@ class PubChemScraperApp:
             filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
         )
 
-        if file_path:
-            self.excel_file = file_path
+        if file_path and self.open_excel_session(file_path):
             self.file_label.config(text=os.path.basename(file_path), fg="green")
             self.log(f"✓ Excel loaded: {os.path.basename(file_path)}")
             messagebox.showinfo("Success", f"Excel loaded: {os.path.basename(file_path)}")
-            wb = load_workbook(file_path)
-            
-            sheet = wb.active
-
-            headers = [cell.value for cell in sheet[1] if cell.value]
-
-            self.include_cas.set('CAS No.' in headers)
-            self.include_formula.set('Molecular Formula' in headers)
-            self.include_molweight.set('Molecular Weight' in headers)
-            self.include_iupac.set('IUPAC Name' in headers)
-            self.include_smiles.set('SMILES' in headers)
-            self.include_density.set('Density' in headers)
-    
-    def fetch_preferred_name(self, cid):
+
+            for key, included in workbook.detect_columns(file_path).items():
+                getattr(self, f"include_{key}").set(included)
+
+    def open_excel_session(self, file_path, create=False):
+        """Switch the log to ``file_path``. Returns False if the user chose to stay on the current file."""
+        # Rows queued for the previous file are written before switching
+        if not self.flush_excel() and not messagebox.askyesno(
+            "Unsaved Rows",
+            f"{self.excel_session.pending} row(s) could not be saved to "
+            f"{os.path.basename(self.excel_session.file_path)}.\n\n"
+            "Close that file and choose No to keep using it, or Yes to switch anyway and lose them."
+        ):
+            return False
+
+        if create:
+            workbook.create_workbook(file_path, self.selected_columns())
+
+        self.excel_session = workbook.WorkbookSession(file_path)
+        self.excel_file = file_path
+        self.excel_locked = False
+        return True
+
+    def autosave_excel(self):
+        if self.excel_session and self.excel_session.pending:
+            threading.Thread(target=self.flush_excel, daemon=True).start()
+        self.root.after(EXCEL_FLUSH_INTERVAL, self.autosave_excel)
+
+    def flush_excel(self):
+        """Save queued rows. Returns False if rows are still waiting."""
+        session = self.excel_session
+        if session is None:
+            return True
+
         try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON"
-            response = requests.get(url, timeout=10)
+            saved = session.flush()
 
-            if response.status_code == 200:
-                data = response.json()
-                record = data.get("Record", {})
-                return record.get("RecordTitle", "Not available")
+        except PermissionError:
+            if not self.excel_locked:
+                self.log_error("File Locked", "Close Excel file first", f"{session.pending} row(s) waiting")
+            self.excel_locked = True
+            return False
 
-        except:
-            pass
+        except Exception as e:
+            self.log_error("Save Error", str(e), f"{session.pending} row(s) waiting")
+            return False
+
+        if saved:
+            self.excel_locked = False
+            self.log(f"✓ Saved {saved} row(s) to {os.path.basename(session.file_path)}")
+
+        return True
 
-        return None, None
-    
     def open_pubchem_page(self):
         if not self.current_data:
             messagebox.showwarning(
@@ -1551,37 +1354,14 @@ class PubChemScraperApp:
             )
             return
 
-        cid = self.current_data.get("cid")
+        cid = self.current_data.cid
         if cid:
             webbrowser.open_new(f"https://pubchem.ncbi.nlm.nih.gov/compound/{cid}")
     
-    def is_online(self):
-        try:
-            requests.get("https://pubchem.ncbi.nlm.nih.gov", timeout=2)
-            return True
-        except:
-            return False
-
-    def normalize_key(self, name: str) -> str:
-        return re.sub(r"\s+", " ", name.strip().lower())
-
-    def compute_hash(self, raw_bytes: bytes) -> str:
-        return hashlib.sha256(raw_bytes).hexdigest()
-
     def search_chemical(self):
         raw_query = self.name_entry.get().strip()
         chemical_name = raw_query.lower()
-        key = self.normalize_key(raw_query)
-
-        now = time.time()
 
-        if self.search_in_progress:
-            self.log("⏳ Search already in progress")
-            return
-
-        if now - self.last_search_time < 1:
-            self.log("⏳ Please wait before searching again")
-            return
         if self.last_searched_query == chemical_name and self.current_data:
             self.log("ℹ Same compound already loaded")
             return
@@ -1589,300 +1369,140 @@ class PubChemScraperApp:
             messagebox.showwarning("Input Error", "Please enter a chemical name")
             return
 
-        self.clear_results()   # 🔑 ALWAYS reset UI
-        self.hide_suggestions()
-        self.search_in_progress = True
-        self.last_search_time = now
-
-        online = self.is_online()
+        # A newer search supersedes the running one instead of waiting for it
+        if self.search_job is not None:
+            self.search_job.cancel()
+            self.log(f"✗ Search #{self.search_job.id} superseded")
 
-        cache_key = None
+        job = SearchJob()
+        self.search_job = job
 
-        if key in self.cache:
-            cache_key = key
-        elif chemical_name in self.cas_index:
-            cache_key = self.cas_index[chemical_name]
-        elif key in self.iupac_index:
-            cache_key = self.iupac_index[key]
-        elif raw_query in self.smiles_index:
-            cache_key = self.smiles_index[raw_query]
-
-        if cache_key is not None and cache_key in self.cache and not online:
-            data = self.cache[cache_key]
+        self.clear_results()   # 🔑 ALWAYS reset UI
+        self.hide_suggestions()
+        self.suggestion_confirmed = False
 
-            self.log("✓ Loaded from local cache")
+        self.log(f"\n{'='*40}")
+        self.log(f"Searching: {chemical_name} (#{job.id})")
+        self.log(f"{'='*40}")
 
-            self.current_data = data
-            self.last_searched_query = chemical_name
+        threading.Thread(
+            target=self.run_search,
+            args=(job, raw_query, chemical_name),
+            daemon=True
+        ).start()
 
-            # Populate UI (same as before)
-            self.title_var.set(data["name"])
-            self.cas_var.set(data["cas"])
-            self.formula_var.set(data["formula"])
-            self.molweight_var.set(f'{data["mw"]} {data["mw_u"]}')
-            self.density_var.set(
-                f'{data["dens"]} {data["dens_u"]}' if data["dens"] is not None else "Not available"
+    def run_search(self, job, raw_query, chemical_name):
+        # Worker thread: every widget update goes through self.ui
+        try:
+            compound = self.engine.lookup(
+                raw_query,
+                images=True,
+                on_update=self.on_compound_refreshed,
+                search_job=job
             )
+            self.ui(self.finish_search, job, chemical_name, compound, None)
 
-            self.set_text_readonly(self.iupac_text, data["iupac"])
-            self.set_text_readonly(self.smiles_text, data["smiles"])
-
-            self.hazard_text.delete(1.0, tk.END)
-            if data.get("ghs"):
-                for i, stmt in enumerate(data["ghs"], 1):
-                    self.hazard_text.insert(tk.END, f"{i}. {stmt}\n")
-            else:
-                self.hazard_text.insert(tk.END, "No hazard data (cached)")
+        except SearchCancelled:
+            pass
 
-            try:
-                img = Image.open(BytesIO(requests.get(data["img"], timeout=5).content))
-                img.thumbnail((500, 320))
-                photo = ImageTk.PhotoImage(img)
-                self.image_label.config(image=photo, text="")
-                self.image_label.image = photo
-            except:
-                self.image_label.config(text="Offline (no image)", image="")
+        except Exception as e:
+            self.ui(self.finish_search, job, chemical_name, None, e)
 
-            self.search_in_progress = False
+    def finish_search(self, job, chemical_name, compound, error):
+        # Results of superseded searches are never painted
+        if job is not self.search_job:
             return
 
-        now = time.time()
-
-        # Update search state
-        self.search_in_progress = True
-        self.last_search_time = now
-
-        self.suggestion_confirmed = False
-
-        self.log(f"\n{'='*40}")
-        self.log(f"Searching: {chemical_name}")
-        self.log(f"{'='*40}")
-
-        try:
-            search_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{chemical_name}/JSON"
-            response = requests.get(search_url, timeout=10)
+        self.search_job = None
 
-            if response.status_code != 200:
-                self.log(f"✗ Chemical not found")
-                messagebox.showerror("Not Found", f"'{chemical_name}' not found")
-                return
+        if error is not None:
+            self.log_error("Error", str(error), f"Type: {type(error).__name__}")
+            messagebox.showerror("Error", f"Error: {str(error)}")
+            return
 
-            data = response.json()
-            cid = data['PC_Compounds'][0]['id']['id']['cid']
-            self.log(f"✓ CID: {cid}")
-            preferred_name = self.fetch_preferred_name(cid)
-            self.title_var.set(preferred_name)
+        if compound is None:
+            messagebox.showerror("Not Found", f"'{chemical_name}' not found")
+            return
 
+        self.show_compound(compound)
+        self.last_searched_query = chemical_name
 
-            molecular_weight_value, molecular_weight_unit = self.fetch_molecular_weight(cid)
-            density_value, density_unit = self.fetch_density(cid)
-            if density_value is not None:
-                self.density_var.set(f"{density_value} {density_unit}")
-                self.log(f"✓ Density: {density_value} {density_unit}")
-            else:
-                self.density_var.set("Not available")
-                self.log(f"none")
+        if compound.source != "cache":
+            self.log(f"{'='*40}")
+            self.log(f"✓ Ready to save!")
+            self.log(f"{'='*40}\n")
 
-            molecular_formula = "Not available"
+    def on_compound_refreshed(self, compound):
+        # Called from a pool thread once a background refresh found new data
+        self.ui(self.apply_refreshed_compound, compound, key="compound")
 
-            try:
-                props = data['PC_Compounds'][0]['props']
-                for prop in props:
-                    if prop['urn']['label'] == 'Molecular Formula':
-                        molecular_formula = prop['value'].get('sval', "Not available")
-                        break
-            except:
-                pass
+    def apply_refreshed_compound(self, compound):
+        if self.current_data is None or self.current_data.cid != compound.cid:
+            return
 
-            self.formula_var.set(molecular_formula)
-            self.molweight_var.set(f"{molecular_weight_value} {molecular_weight_unit}")
+        self.clear_results()
+        self.show_compound(compound)
+        self.log("↻ Updated with fresh PubChem data")
+
+    def show_compound(self, compound):
+        self.current_data = compound
+
+        self.title_var.set(compound.name)
+        self.cas_var.set(compound.cas)
+        self.formula_var.set(compound.formula)
+        self.molweight_var.set(f"{compound.mw} {compound.mw_u}")
+        self.density_var.set(
+            f"{compound.dens} {compound.dens_u}" if compound.dens is not None else "Not available"
+        )
 
-            self.log(f"✓ Formula: {molecular_formula}")
-            self.log(f"✓ Mol.Weight: {molecular_weight_value} {molecular_weight_unit}")
+        self.set_text_readonly(self.iupac_text, compound.iupac)
+        self.set_text_readonly(self.smiles_text, compound.smiles)
 
-            # Get CAS number
-            cas_number = "Not available"
+        self.image_label.config(image="", text="No image")
+        if compound.image_data:
             try:
-                syn_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/synonyms/JSON"
-                syn_response = requests.get(syn_url, timeout=10)
-                if syn_response.status_code == 200:
-                    syn_data = syn_response.json()
-                    synonyms = syn_data['InformationList']['Information'][0]['Synonym']
-                    for syn in synonyms:
-                        if '-' in syn and syn.replace('-', '').isdigit():
-                            parts = syn.split('-')
-                            if len(parts) == 3 and parts[2].isdigit() and len(parts[2]) == 1:
-                                cas_number = syn
-                                break
-            except:
-                pass
-
-            self.cas_var.set(cas_number)
-            self.log(f"✓ CAS: {cas_number}")
+                from PIL import Image, ImageTk
 
-            iupac_name = self.fetch_iupac_name(cid)
-            smiles = self.fetch_smiles(cid)
-            self.set_text_readonly(self.iupac_text, iupac_name)
-            self.set_text_readonly(self.smiles_text, smiles)
-
-            # Get structure image
-            image_url = f"https://pubchem.ncbi.nlm.nih.gov/image/imgsrv.fcgi?cid={cid}&t=l"
-            try:
-                img_response = requests.get(image_url, timeout=10)
-                if img_response.status_code == 200:
-                    img = Image.open(BytesIO(img_response.content))
-                    img.thumbnail((500, 320))
-                    photo = ImageTk.PhotoImage(img)
-                    self.image_label.config(image=photo, text="")
-                    self.image_label.image = photo
-                    self.log(f"✓ Image loaded")
+                # Stored thumbnails are already sized for the panel
+                img = Image.open(BytesIO(compound.image_thumb or compound.image_data))
+                img.thumbnail((500, 320))
+                photo = ImageTk.PhotoImage(img)
+                self.image_label.config(image=photo, text="")
+                self.image_label.image = photo
+                self.log(f"✓ Image loaded")
             except:
                 pass
+        elif compound.source == "cache":
+            self.image_label.config(text="Offline (no image)", image="")
 
-            # Fetch GHS data
-            pictograms, hazard_statements = self.fetch_ghs_data(cid)
-
-            if pictograms:
-                images, labels = self.load_ghs_images(pictograms)
-                if images:
-                    self.display_ghs_images(images, labels)
-                    self.log(f"✓ GHS: {len(images)} pictogram(s)")
-
-            if hazard_statements:
-                self.hazard_text.delete(1.0, tk.END)
-                for idx, statement in enumerate(hazard_statements[:5], 1):
-                    self.hazard_text.insert(tk.END, f"{idx}. {statement}\n")
-                self.log(f"✓ Hazards: {len(hazard_statements[:5])}")
-            else:
-                self.hazard_text.delete(1.0, tk.END)
-                self.hazard_text.insert(tk.END, "No hazards available")
-
-            # Store current data
-            self.current_data = {
-                'name': preferred_name,
-                'cid': cid,   
-                'cas': cas_number,
-                'formula': molecular_formula,
-                'molweight_value': molecular_weight_value,  
-                'molweight_unit': 'g/mol',
-                'density_value': density_value,               
-                'density_unit': density_unit,      
-                'iupac': iupac_name,
-                'smiles': smiles,
-                'image': image_url
-            }
-
-            # ---------- SAVE TO LOCAL CACHE ----------
-            key = self.normalize_key(preferred_name)
-
-            if key not in self.cache:
-                self.cache[key] = {
-                    "cid": cid,
-                    "name": preferred_name,
-                    "cas": cas_number,
-                    "formula": molecular_formula,
-                    "mw": molecular_weight_value,
-                    "mw_u": "g/mol",
-                    "dens": density_value,
-                    "dens_u": density_unit,
-                    "iupac": iupac_name,
-                    "smiles": smiles,
-                    "ghs": hazard_statements[:2] if hazard_statements else [],
-                    "img": image_url,
-                    "ts": int(time.time())
-                }
-
-                try:
-                    raw = json.dumps(
-                        self.cache,
-                        separators=(",", ":"),
-                        ensure_ascii=False
-                    ).encode("utf-8")
-
-                    with open(CACHE_FILE, "wb") as f:
-                        f.write(raw)
-
-                    with open(CACHE_SIG_FILE, "w") as sig:
-                        sig.write(self.compute_hash(raw))
-
-                    self.log("✓ Cached locally")
-
-                except:
-                    self.log("⚠ Failed to save cache")
-
-            self.last_searched_query = chemical_name
-
-            self.log(f"{'='*40}")
-            self.log(f"✓ Ready to save!")
-            self.log(f"{'='*40}\n")
-        
+        images, labels = self.load_ghs_images(compound)
+        if images:
+            self.display_ghs_images(images, labels)
+            self.log(f"✓ GHS: {len(images)} pictogram(s)")
 
-        except Exception as e:
-            self.search_in_progress = False
-            self.log_error("Error", str(e), f"Type: {type(e).__name__}")
-            messagebox.showerror("Error", f"Error: {str(e)}")
-        finally:
-            self.search_in_progress = False
+        self.hazard_text.delete(1.0, tk.END)
+        if compound.ghs:
+            for idx, statement in enumerate(compound.ghs[:5], 1):
+                self.hazard_text.insert(tk.END, f"{idx}. {statement}\n")
+            self.log(f"✓ Hazards: {len(compound.ghs[:5])}")
+        elif compound.source == "cache":
+            self.hazard_text.insert(tk.END, "No hazard data (cached)")
+        else:
+            self.hazard_text.insert(tk.END, "No hazards available")
 
     def silent_refresh(self, key):
         try:
-            # Quick online test
-            requests.get("https://pubchem.ncbi.nlm.nih.gov", timeout=2)
-
-            data = self.cache[key]
-            cid = data["cid"]
-            updated = False
-
-            if not data.get("smiles"):
-                data["smiles"] = self.fetch_smiles(cid)
-                updated = True
-
-            if not data.get("ghs"):
-                _, hazards = self.fetch_ghs_data(cid)
-                data["ghs"] = hazards[:2]
-                updated = True
-
-            if updated:
-                raw = json.dumps(
-                    self.cache,
-                    separators=(",", ":"),
-                    ensure_ascii=False
-                ).encode("utf-8")
-
-                with open(CACHE_FILE, "wb") as f:
-                    f.write(raw)
-
-                with open(CACHE_SIG_FILE, "w") as sig:
-                    sig.write(self.compute_hash(raw))
-
+            if self.engine.is_online():
+                self.engine.refresh(key)
         except:
             pass
 
-    
     def set_text_readonly(self, widget, value):
         widget.config(state="normal")
         widget.delete("1.0", tk.END)
         widget.insert("1.0", value)
         widget.config(state="disabled")
 
-    def fetch_molecular_weight(self, cid):
-        try:
-            url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/MolecularWeight/JSON"
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                mw_raw = data['PropertyTable']['Properties'][0]['MolecularWeight']
-                mw = float(mw_raw)
-                return mw, "g/mol"
-
-
-        except Exception as e:
-            
-            self.log(f"⚠ MWT error: {str(e)}")
-
-        return None, None
-
     def add_to_excel(self):
         if not self.excel_file:
             messagebox.showwarning("No File", "Create or load Excel first")
@@ -1892,75 +1512,126 @@ class PubChemScraperApp:
             messagebox.showwarning("No Data", "Search for a chemical first")
             return
 
-        try:
-            wb = load_workbook(self.excel_file)
-            sheet = wb.active
+        # Queued only; autosave_excel writes rows in batches
+        self.excel_session.append([self.current_data], self.selected_columns())
+        self.log(f"\n✓ Added '{self.current_data.name}' ({self.excel_session.pending} row(s) to save)")
+        messagebox.showinfo("Success", f"Added '{self.current_data.name}'!")
 
-            next_row = sheet.max_row + 1
-            sl_no = next_row - 1
+        self.name_entry.delete(0, tk.END)
+        self.clear_results()
 
-            col = 1
-            sheet.cell(row=next_row, column=col).value = sl_no
-            col += 1
+    # ================= CACHE EXPORT =================
 
-            sheet.cell(row=next_row, column=col).value = self.current_data['name']
-            col += 1
+    def start_cache_export(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[
+                ("Excel files", "*.xlsx"),
+                ("CSV files", "*.csv"),
+                ("JSON Lines", "*.jsonl")
+            ]
+        )
 
-            if self.include_cas.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['cas']
-                col += 1
+        if file_path:
+            threading.Thread(
+                target=self.export_cache,
+                args=(file_path, self.selected_columns()),
+                daemon=True
+            ).start()
 
-            if self.include_formula.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['formula']
-                col += 1
+    def export_cache(self, file_path, columns):
+        started = time.time()
+        self.log(f"Exporting cache to {os.path.basename(file_path)}...")
+        if not self.engine.cache_usable(timeout=None):
+            self.log_error("Export Error", "The local cache could not be opened", "")
+            return
 
-            if self.include_molweight.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['molweight_value']
-                col += 1
-                sheet.cell(row=next_row, column=col).value = self.current_data['molweight_unit']
-                col += 1
-            
-            if self.include_density.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['density_value']
-                col += 1
-                sheet.cell(row=next_row, column=col).value = self.current_data['density_unit']
-                col += 1
+        try:
+            count = workbook.export_compounds(file_path, self.engine.cache.iter_compounds(), columns)
+        except PermissionError:
+            self.log_error("File Locked", "Close the export file first", "")
+            return
+        except Exception as e:
+            self.log_error("Export Error", str(e), "")
+            return
 
-            if self.include_quantity.get():
-                  col += 2
+        elapsed = max(time.time() - started, 0.001)
+        self.log(f"✓ Exported {count} compound(s) in {elapsed:.1f} s")
 
-            if self.include_equivalence.get():
-                col += 1  # leave cell empty intentionally
+    # ================= BATCH IMPORT =================
 
-            if self.include_iupac.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['iupac']
-                col += 1
+    def start_batch_import(self):
+        if not self.excel_file:
+            messagebox.showwarning("No File", "Create or load Excel first")
+            return
 
-            if self.include_smiles.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['smiles']
-                col += 1    
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Name lists", "*.csv *.txt *.xlsx"),
+                ("All files", "*.*")
+            ]
+        )
 
-            if self.include_image_link.get():
-                sheet.cell(row=next_row, column=col).value = self.current_data['image']
-                col += 1
+        if file_path:
+            threading.Thread(
+                target=self.batch_import,
+                args=(file_path, self.selected_columns()),
+                daemon=True
+            ).start()
 
-            wb.save(self.excel_file)
-            self.log(f"\n✓✓✓ SAVED! ✓✓✓")
-            messagebox.showinfo("Success", f"Added '{self.current_data['name']}'!")
+    def batch_import(self, file_path, columns):
+        started = time.time()
 
-            self.name_entry.delete(0, tk.END)
-            self.clear_results()
+        try:
+            names = workbook.read_name_list(file_path)
+        except Exception as e:
+            self.log_error("Batch Import", "Could not read name list", str(e))
+            return
 
-        except PermissionError:
-            self.log_error("File Locked", "Close Excel file first", "")
-            messagebox.showerror("Locked", "Close the Excel file first")
+        self.log(f"\n{'='*40}")
+        self.log(f"Batch import: {len(names)} name(s) from {os.path.basename(file_path)}")
+        self.log(f"{'='*40}")
 
+        try:
+            results = self.engine.fetch_many(names, with_density=columns["density"])
         except Exception as e:
-            
-            self.log_error("Save Error", str(e), "")
-            messagebox.showerror("Error", f"Save failed: {str(e)}")
+            self.log_error("Batch Import", "PubChem property request failed", str(e))
+            return
+
+        compounds = [r.compound for r in results if r.compound]
+
+        # ---- Write every row in one pass ----
+        self.excel_session.append(compounds, columns)
+
+        if not self.flush_excel():
+            self.ui(messagebox.showerror, "Locked", "Close the Excel file first — rows will be saved automatically")
+            return
+
+        elapsed = max(time.time() - started, 0.001)
+        failed = len(names) - len(compounds)
+
+        self.log(f"{'='*40}")
+        self.log(f"✓ Batch done: {len(compounds)} added, {failed} failed")
+        self.log(f"  {elapsed:.1f} s ({len(compounds) / elapsed:.1f} compounds/s)")
+        self.log(f"{'='*40}\n")
+
+def report_startup(app):
+    """Print startup timings as one JSON line and exit (``--startup-benchmark``)."""
+    import json
+
+    app.engine.wait_ready()
+    print(json.dumps({
+        "first_paint_ms": round(app.first_paint * 1000, 1),
+        "ready_ms": round((time.perf_counter() - STARTED) * 1000, 1),
+        "heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules],
+    }), flush=True)
+    app.engine.close()
+    app.root.destroy()
+
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = PubChemScraperApp(root)
+    if "--startup-benchmark" in sys.argv:
+        root.after_idle(lambda: root.after_idle(report_startup, app))
     root.mainloop()
@@ -0,0 +1,44 @@
+import os
+import sys
+
+
+def get_app_data_dir():
+    base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    path = os.path.join(base, "LabBuddy", "backend")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and PyInstaller """
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+APP_DATA_DIR = get_app_data_dir()
+
+CACHE_DB_FILE = os.path.join(APP_DATA_DIR, "chemical_cache.db")
+IMAGE_DIR = os.path.join(APP_DATA_DIR, "images")
+PICTOGRAM_DIR = os.path.join(APP_DATA_DIR, "pictograms")
+ASSET_DIR = os.path.join(APP_DATA_DIR, "assets")   # preprocessed UI images
+
+# Legacy JSON cache, migrated into CACHE_DB_FILE on first start
+CACHE_FILE = os.path.join(APP_DATA_DIR, "chemical_cache.json")
+CACHE_SIG_FILE = os.path.join(APP_DATA_DIR, "chemical_cache.sig")
+
+readme_path = os.path.join(APP_DATA_DIR, "README.txt")
+if not os.path.exists(readme_path):
+    try:
+        with open(readme_path, "w", encoding="utf-8") as f:
+            f.write(
+                "LAB Buddy – Backend Data Folder\n\n"
+                "This folder stores local cache files used by LAB Buddy\n"
+                "to enable offline operation and faster searches.\n\n"
+                "⚠ Do not delete or modify files in this folder.\n"
+                "Deleting it may require LAB Buddy to re-download data.\n"
+            )
+    except:
+        pass
@@ -0,0 +1,104 @@
+"""The nine GHS hazard pictograms, downloaded once and kept pre-sized on disk."""
+import os
+import re
+import threading
+from io import BytesIO
+
+from lab_buddy.paths import PICTOGRAM_DIR, resource_path
+from lab_buddy.pubchem import PUBCHEM_URL
+
+GHS_CODES = tuple(f"GHS0{n}" for n in range(1, 10))
+PICTOGRAM_SIZE = (100, 100)
+
+
+def pictogram_code(url):
+    """``GHS02`` for any PubChem pictogram URL, or None if it is not one."""
+    match = re.search(r"(GHS0[1-9])", url or "")
+    return match.group(1) if match else None
+
+
+def pictogram_url(code):
+    return f"{PUBCHEM_URL}/images/ghs/{code}.gif"
+
+
+class PictogramStore:
+    """PNG bytes of each GHS pictogram, already resized to ``PICTOGRAM_SIZE``.
+
+    Pictograms shipped with the app (``ghs/GHS01.png`` ...) are used as they
+    are. Any other pictogram is downloaded from PubChem once, resized and
+    written to ``root``; after that every lookup is served from memory.
+    """
+
+    def __init__(self, client, root=PICTOGRAM_DIR, size=PICTOGRAM_SIZE):
+        self.client = client
+        self.root = root
+        self.size = size
+        self.memo = {}
+        self.lock = threading.Lock()
+
+    def path(self, code):
+        return os.path.join(self.root, f"{code}.png")
+
+    def read(self, code):
+        for path in (resource_path(os.path.join("ghs", f"{code}.png")), self.path(code)):
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except OSError:
+                continue
+        return None
+
+    def get(self, code, online=True):
+        """Pre-sized PNG bytes of pictogram ``code``, or None if unavailable."""
+        with self.lock:
+            data = self.memo.get(code)
+        if data is not None:
+            return data
+
+        data = self.read(code)
+        if data is None and online:
+            data = self.download(code)
+
+        if data is not None:
+            with self.lock:
+                self.memo[code] = data
+
+        return data
+
+    def download(self, code):
+        from PIL import Image
+
+        raw = self.client.image_bytes(pictogram_url(code), "pictogram", retries=0)
+        if not raw:
+            return None
+
+        try:
+            img = Image.open(BytesIO(raw)).convert("RGBA")
+            img = img.resize(self.size, Image.Resampling.LANCZOS)
+            out = BytesIO()
+            img.save(out, format="PNG")
+            data = out.getvalue()
+        except Exception:
+            return None
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.path(code)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(code))
+
+        return data
+
+    def missing(self):
+        return [code for code in GHS_CODES if self.read(code) is None]
+
+    def preload(self):
+        """Download every pictogram not stored yet. Returns how many were fetched."""
+        fetched = 0
+        for code in self.missing():
+            try:
+                if self.get(code) is not None:
+                    fetched += 1
+            except Exception:
+                break   # offline: try again next start
+        return fetched
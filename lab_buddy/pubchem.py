@@ -0,0 +1,542 @@
+import random
+import re
+import time
+import threading
+from urllib.parse import quote
+
+from lab_buddy.cas import is_valid_cas
+
+PUBCHEM_URL = "https://pubchem.ncbi.nlm.nih.gov"
+PUG_URL = f"{PUBCHEM_URL}/rest/pug"
+PUG_VIEW_URL = f"{PUBCHEM_URL}/rest/pug_view"
+
+FETCH_WORKERS = 8        # parallel PubChem requests per search
+BATCH_CHUNK = 100        # CIDs per PUG REST property/synonym request
+
+# Per-endpoint timeouts (seconds)
+HTTP_TIMEOUTS = {
+    "pug": 10,
+    "pug_view": 15,
+    "image": 10,
+    "pictogram": 5,
+    "autocomplete": 3,
+    "probe": 2,
+}
+
+NOT_AVAILABLE = "Not available"
+
+OFFLINE_AFTER = 2        # consecutive connection failures before PubChem counts as unreachable
+OFFLINE_COOLDOWN = 30    # seconds before an unreachable PubChem is tried again
+
+
+def structure_image_url(cid):
+    return f"{PUBCHEM_URL}/image/imgsrv.fcgi?cid={cid}&t=l"
+
+
+class PubChemOffline(ConnectionError):
+    """Raised instead of a request while PubChem is known to be unreachable."""
+
+
+def is_unreachable(error):
+    """True if ``error`` means PubChem could not be reached, rather than a bad or slow answer."""
+    if isinstance(error, ConnectionError):   # includes PubChemOffline
+        return True
+
+    import requests
+    return isinstance(error, requests.ConnectionError)
+
+
+class Connectivity:
+    """Circuit breaker learning whether PubChem is reachable from real requests.
+
+    Any HTTP answer counts as online. ``OFFLINE_AFTER`` consecutive
+    connection failures or connect timeouts switch to offline (slow reads
+    do not count, the server was reached): requests then fail
+    immediately, until ``OFFLINE_COOLDOWN`` has passed and the next
+    request is let through as a trial.
+    """
+
+    UNKNOWN, ONLINE, OFFLINE = "unknown", "online", "offline"
+
+    def __init__(self, threshold=OFFLINE_AFTER, cooldown=OFFLINE_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.UNKNOWN
+        self.failures = 0
+        self.opened_at = 0
+        self.lock = threading.Lock()
+
+    def available(self):
+        """False while offline and still cooling down; a request may be tried otherwise."""
+        with self.lock:
+            return self.state != self.OFFLINE or time.time() - self.opened_at >= self.cooldown
+
+    def needs_probe(self):
+        with self.lock:
+            return self.state == self.UNKNOWN or (
+                self.state == self.OFFLINE and time.time() - self.opened_at >= self.cooldown
+            )
+
+    def succeeded(self):
+        with self.lock:
+            self.state = self.ONLINE
+            self.failures = 0
+
+    def failed(self):
+        with self.lock:
+            self.failures += 1
+
+            if self.state == self.OFFLINE or self.failures >= self.threshold:
+                # (Re)open the breaker, including after a failed trial request
+                self.state = self.OFFLINE
+                self.opened_at = time.time()
+
+
+class PubChemClient:
+    """Shared HTTP client for every PubChem endpoint.
+
+    One pooled ``requests.Session`` keeps connections to PubChem alive between
+    calls. Failed connections and 5xx answers (PubChem replies 503 when it is
+    busy) are retried with jittered exponential backoff. Every outcome feeds
+    ``connectivity``, which stops requests early while PubChem is unreachable.
+    """
+
+    RETRY_STATUS = {500, 502, 503, 504}
+
+    def __init__(self, pool_size=FETCH_WORKERS, retries=3, backoff=0.5, max_backoff=8, connectivity=None):
+        self.connectivity = connectivity or Connectivity()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self._session = None
+        self.lock = threading.Lock()
+
+    @property
+    def session(self):
+        # requests is only imported once the first call goes out
+        with self.lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers["User-Agent"] = "LAB Buddy/1.0"
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+
+            return self._session
+
+    def get(self, url, endpoint="pug", retries=None, **kwargs):
+        return self.request("GET", url, endpoint, retries, **kwargs)
+
+    def post(self, url, data=None, endpoint="pug", retries=None, **kwargs):
+        return self.request("POST", url, endpoint, retries, data=data, **kwargs)
+
+    def request(self, method, url, endpoint="pug", retries=None, **kwargs):
+        retries = self.retries if retries is None else retries
+        kwargs.setdefault("timeout", HTTP_TIMEOUTS.get(endpoint, 10))
+
+        session = self.session
+        import requests
+
+        for attempt in range(retries + 1):
+            if not self.connectivity.available():
+                raise PubChemOffline(f"PubChem unreachable, not requesting {url}")
+
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A ReadTimeout (slow PUG-View record) means PubChem is reachable;
+                # ConnectTimeout is also a ConnectionError and does count
+                if isinstance(e, requests.ConnectionError):
+                    self.connectivity.failed()
+                if attempt >= retries:
+                    raise
+                response = None
+            else:
+                self.connectivity.succeeded()
+
+            if response is not None:
+                if response.status_code not in self.RETRY_STATUS or attempt >= retries:
+                    return response
+
+            time.sleep(self.retry_delay(attempt, response))
+
+    def retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            return min(int(retry_after), self.max_backoff)
+
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return random.uniform(delay / 2, delay)
+
+    def close(self):
+        with self.lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    # ================= ENDPOINTS =================
+
+    def ping(self):
+        try:
+            self.request("HEAD", PUBCHEM_URL, "probe", retries=0)
+            return True
+        except:
+            return False
+
+    def is_online(self):
+        """Connectivity as learned from recent requests; probes only when that is unknown or stale."""
+        if self.connectivity.needs_probe():
+            return self.ping()
+        return self.connectivity.available()
+
+    def search_name(self, name):
+        """Full PUG REST compound record for a name, or None if PubChem has no match."""
+        response = self.get(f"{PUG_URL}/compound/name/{quote(name, safe='')}/JSON", "pug")
+
+        if response.status_code != 200:
+            return None
+
+        return response.json()
+
+    def resolve_cid(self, name):
+        response = self.get(f"{PUG_URL}/compound/name/{quote(name, safe='')}/cids/JSON", "pug")
+
+        if response.status_code != 200:
+            return None
+
+        return response.json()['IdentifierList']['CID'][0]
+
+    def compound_record(self, cid):
+        """Download and parse the PUG-View record of a compound once.
+
+        The returned ``Record`` dict is shared by every ``record_*`` extractor
+        below, so one lookup costs a single PUG-View round trip.
+        """
+        response = self.get(f"{PUG_VIEW_URL}/data/compound/{cid}/JSON", "pug_view")
+
+        if response.status_code != 200:
+            return None
+
+        return response.json().get("Record", {})
+
+    def molecular_weight(self, cid):
+        response = self.get(f"{PUG_URL}/compound/cid/{cid}/property/MolecularWeight/JSON", "pug")
+
+        if response.status_code == 200:
+            data = response.json()
+            mw_raw = data['PropertyTable']['Properties'][0]['MolecularWeight']
+            return float(mw_raw), "g/mol"
+
+        return None, None
+
+    def synonyms(self, cid):
+        response = self.get(f"{PUG_URL}/compound/cid/{cid}/synonyms/JSON", "pug")
+
+        if response.status_code != 200:
+            return []
+
+        return response.json()['InformationList']['Information'][0].get('Synonym', [])
+
+    def cas_number(self, cid):
+        return pick_cas_number(self.synonyms(cid))
+
+    def image_bytes(self, url, endpoint="image", retries=None):
+        response = self.get(url, endpoint, retries=retries)
+
+        if response.status_code != 200:
+            return None
+
+        return response.content
+
+    def autocomplete(self, query, limit=10):
+        url = f"{PUBCHEM_URL}/rest/autocomplete/compound/{quote(query, safe='')}/json?limit={limit}"
+        response = self.get(url, "autocomplete", retries=0)
+
+        if response.status_code != 200:
+            return None
+
+        data = response.json()
+        if 'dictionary_terms' in data and 'compound' in data['dictionary_terms']:
+            return data['dictionary_terms']['compound'][:limit]
+
+        return []
+
+    def properties_batch(self, cids):
+        """MolecularFormula/Weight, IUPAC, SMILES and title for many CIDs, one POST per chunk."""
+        url = (
+            f"{PUG_URL}/compound/cid/property/"
+            "Title,MolecularFormula,MolecularWeight,IUPACName,SMILES/JSON"
+        )
+        properties = {}
+
+        for i in range(0, len(cids), BATCH_CHUNK):
+            chunk = cids[i:i + BATCH_CHUNK]
+            response = self.post(url, {"cid": ",".join(map(str, chunk))}, "pug")
+
+            if response.status_code == 200:
+                for prop in response.json()['PropertyTable']['Properties']:
+                    properties[prop['CID']] = prop
+
+        return properties
+
+    def synonyms_batch(self, cids):
+        """Synonym lists for many CIDs, one POST per chunk."""
+        url = f"{PUG_URL}/compound/cid/synonyms/JSON"
+        synonyms = {}
+
+        for i in range(0, len(cids), BATCH_CHUNK):
+            chunk = cids[i:i + BATCH_CHUNK]
+            response = self.post(url, {"cid": ",".join(map(str, chunk))}, "pug")
+
+            if response.status_code == 200:
+                for info in response.json()['InformationList']['Information']:
+                    synonyms[info['CID']] = info.get('Synonym', [])
+
+        return synonyms
+
+    def cids_by_cas(self, cas_numbers):
+        """CAS number -> CID for many CAS numbers via the RN cross-reference, one POST per chunk.
+
+        The synonyms of every matched compound come back with it, so each
+        CID is mapped to the requested CAS numbers among its synonyms.
+        Returns ``(cids, synonyms)`` with synonyms keyed by CID.
+        """
+        url = f"{PUG_URL}/compound/xref/RN/synonyms/JSON"
+        cids = {}
+        synonyms = {}
+
+        for i in range(0, len(cas_numbers), BATCH_CHUNK):
+            chunk = cas_numbers[i:i + BATCH_CHUNK]
+            wanted = set(chunk)
+            response = self.post(url, {"RN": ",".join(chunk)}, "pug")
+
+            if response.status_code != 200:
+                continue
+
+            for info in response.json()['InformationList']['Information']:
+                cid = info['CID']
+                names = info.get('Synonym', [])
+                synonyms[cid] = names
+
+                for name in names:
+                    # Several CIDs may carry one RN; PubChem's lowest CID is the parent record
+                    if name in wanted and (name not in cids or cid < cids[name]):
+                        cids[name] = cid
+
+        return cids, synonyms
+
+    def cas_batch(self, cids):
+        return {cid: pick_cas_number(names) for cid, names in self.synonyms_batch(cids).items()}
+
+
+# ================= RECORD EXTRACTORS =================
+# These work on an already-parsed PUG-View ``Record`` dict and never touch
+# the network, so search, batch and refresh paths can share one download.
+
+def compound_formula(search_data):
+    """Molecular formula from a ``compound/name`` PUG REST answer."""
+    try:
+        props = search_data['PC_Compounds'][0]['props']
+        for prop in props:
+            if prop['urn']['label'] == 'Molecular Formula':
+                return prop['value'].get('sval', NOT_AVAILABLE)
+    except:
+        pass
+
+    return NOT_AVAILABLE
+
+
+def pick_cas_number(synonyms):
+    """First synonym that is a CAS number with a correct check digit."""
+    for syn in synonyms:
+        if is_valid_cas(syn):
+            return syn
+
+    return NOT_AVAILABLE
+
+
+def record_title(record):
+    if record:
+        return record.get("RecordTitle", NOT_AVAILABLE)
+
+    return None
+
+
+def record_density(record):
+    if not record:
+        return None, None
+
+    sections = record.get("Section", [])
+
+    for section in sections:
+        if section.get("TOCHeading") == "Chemical and Physical Properties":
+            for sub in section.get("Section", []):
+                if sub.get("TOCHeading") == "Experimental Properties":
+                    for prop in sub.get("Section", []):
+                        if "density" in prop.get("TOCHeading", "").lower():
+                            for info in prop.get("Information", []):
+                                value = info.get("Value", {})
+                                text = ""
+
+                                if "StringWithMarkup" in value:
+                                    text = value["StringWithMarkup"][0].get("String", "")
+                                elif "StringValue" in value:
+                                    text = value["StringValue"]
+
+                                if not text:
+                                    continue
+
+                                # ---- Extract number ----
+                                match = re.search(r"([\d.]+)", text)
+                                if not match:
+                                    continue
+
+                                try:
+                                    density = float(match.group(1))
+                                except ValueError:
+                                    continue
+
+                                # ---- Detect temperature ----
+                                temp_c = 25  # default lab temp
+
+                                if "°f" in text.lower():
+                                    temp_f_match = re.search(r"([\d.]+)\s*°\s*f", text.lower())
+                                    if temp_f_match:
+                                        temp_f = float(temp_f_match.group(1))
+                                        temp_c = round((temp_f - 32) * 5 / 9)
+
+                                elif "°c" in text.lower():
+                                    temp_c_match = re.search(r"([\d.]+)\s*°\s*c", text.lower())
+                                    if temp_c_match:
+                                        temp_c = round(float(temp_c_match.group(1)))
+
+                                return density, f"g/mL @ {temp_c} °C"
+
+    return None, None
+
+
+def record_descriptor(record, heading):
+    """First string of a 'Names and Identifiers > Computed Descriptors' entry."""
+    if not record:
+        return None
+
+    for section in record.get('Section', []):
+        if section.get('TOCHeading') == 'Names and Identifiers':
+            for subsection in section.get('Section', []):
+                if subsection.get('TOCHeading') == 'Computed Descriptors':
+                    for info_section in subsection.get('Section', []):
+                        if info_section.get('TOCHeading') == heading:
+                            for info in info_section.get('Information', []):
+                                markup_list = info.get('Value', {}).get('StringWithMarkup')
+                                if markup_list:
+                                    return markup_list[0].get('String')
+                            break
+                    break
+            break
+
+    return None
+
+
+def record_formula(record):
+    """Molecular formula from a PUG-View record ('Names and Identifiers > Molecular Formula')."""
+    if not record:
+        return NOT_AVAILABLE
+
+    for section in record.get('Section', []):
+        if section.get('TOCHeading') == 'Names and Identifiers':
+            for subsection in section.get('Section', []):
+                if subsection.get('TOCHeading') == 'Molecular Formula':
+                    for info in subsection.get('Information', []):
+                        markup_list = info.get('Value', {}).get('StringWithMarkup')
+                        if markup_list:
+                            return markup_list[0].get('String') or NOT_AVAILABLE
+                    break
+            break
+
+    return NOT_AVAILABLE
+
+
+def record_iupac_name(record):
+    return record_descriptor(record, 'IUPAC Name') or NOT_AVAILABLE
+
+
+def record_smiles(record):
+    return record_descriptor(record, 'SMILES') or NOT_AVAILABLE
+
+
+def find_ghs_section(sections):
+    for section in sections:
+        heading = section.get('TOCHeading', '')
+
+        if 'GHS Classification' in heading:
+            return section
+
+        if 'Section' in section:
+            result = find_ghs_section(section['Section'])
+            if result:
+                return result
+
+    return None
+
+
+def record_ghs_data(record):
+    pictograms = []
+    hazard_statements = []
+
+    if not record:
+        return pictograms, hazard_statements
+
+    for section in record.get('Section', []):
+        if section.get('TOCHeading') == 'Safety and Hazards':
+            ghs_section = find_ghs_section(section.get('Section', []))
+
+            if ghs_section:
+                for info in ghs_section.get('Information', []):
+                    info_name = info.get('Name', '')
+
+                    if info_name == 'Pictogram(s)':
+                        value = info.get('Value', {})
+                        string_with_markup = value.get('StringWithMarkup', [])
+                        for item in string_with_markup:
+                            if len(pictograms) >= 3:
+                                break
+                            markup_list = item.get('Markup', [])
+                            for markup in markup_list:
+                                if len(pictograms) >= 3:
+                                    break
+                                if markup.get('Type') == 'Icon':
+                                    pic_url = markup.get('URL', '')
+                                    pic_label = markup.get('Extra', '')
+                                    if pic_url:
+                                        pictograms.append({
+                                            'url': pic_url,
+                                            'label': pic_label
+                                        })
+
+                    elif 'GHS Hazard Statement' in info_name or info_name == 'Hazard Statement(s)':
+                        value = info.get('Value', {})
+
+                        if 'StringValueList' in value:
+                            for statement in value['StringValueList']:
+                                if len(hazard_statements) >= 5:
+                                    break
+                                hazard_statements.append(statement)
+
+                        elif 'StringValue' in value:
+                            if len(hazard_statements) < 5:
+                                hazard_statements.append(value['StringValue'])
+
+                        elif 'StringWithMarkup' in value:
+                            for item in value['StringWithMarkup']:
+                                if len(hazard_statements) >= 5:
+                                    break
+                                if 'String' in item:
+                                    hazard_statements.append(item['String'])
+            break
+
+    return pictograms, hazard_statements
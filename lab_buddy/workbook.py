@@ -0,0 +1,318 @@
+import csv
+import json
+import os
+import tempfile
+import threading
+
+from lab_buddy.compound import normalize_key
+
+# Optional Excel columns in sheet order: key -> [(header, width), ...]
+# "Sl. No" and "Chemical Name" are always written first.
+COLUMNS = {
+    "cas": [("CAS No.", 16)],
+    "formula": [("Molecular Formula", 20)],
+    "molweight": [("Molecular Weight", 14), ("SI.Unit", 12)],
+    "density": [("Density", 14), ("SI.Unit", 16)],
+    "quantity": [("Quantity", 12), ("SI.Unit", 14)],
+    "equivalence": [("Equivalence", 14)],
+    "iupac": [("IUPAC Name", 45)],
+    "smiles": [("SMILES", 40)],
+    "image_link": [("Image Link", 45)],
+}
+
+DEFAULT_COLUMNS = {
+    "cas": True,
+    "formula": True,
+    "molweight": True,
+    "density": True,
+    "quantity": True,
+    "equivalence": True,
+    "iupac": False,
+    "smiles": False,
+    "image_link": False,
+}
+
+NAME_LIST_HEADERS = (
+    "name", "names", "chemical", "chemical name", "compound", "cas", "cas no.", "cas number"
+)
+
+
+def selected_headers(columns):
+    headers = [('Sl. No', 10), ('Chemical Name', 30)]
+
+    for key, specs in COLUMNS.items():
+        if columns.get(key):
+            headers += specs
+
+    return headers
+
+
+def build_row(sl_no, compound, columns):
+    """Cell values for one compound, matching the selected Excel columns."""
+    row = [sl_no, compound.name]
+
+    if columns.get("cas"):
+        row.append(compound.cas)
+
+    if columns.get("formula"):
+        row.append(compound.formula)
+
+    if columns.get("molweight"):
+        row += [compound.mw, compound.mw_u]
+
+    if columns.get("density"):
+        row += [compound.dens, compound.dens_u]
+
+    if columns.get("quantity"):
+        row += [None, None]  # leave cells empty intentionally
+
+    if columns.get("equivalence"):
+        row.append(None)
+
+    if columns.get("iupac"):
+        row.append(compound.iupac)
+
+    if columns.get("smiles"):
+        row.append(compound.smiles)
+
+    if columns.get("image_link"):
+        row.append(compound.image)
+
+    return row
+
+
+def create_workbook(file_path, columns):
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Chemicals"
+
+    for col, (header, width) in enumerate(selected_headers(columns), start=1):
+        cell = sheet.cell(row=1, column=col)
+        cell.value = header
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+        sheet.column_dimensions[get_column_letter(col)].width = width
+
+    wb.save(file_path)
+
+
+def record_fields(columns):
+    """Unique field names for the selected columns, for CSV/JSONL exports.
+
+    Unit columns share the ``SI.Unit`` header in Excel, so they are named
+    after the column they belong to ("Density SI.Unit").
+    """
+    fields = ["Sl. No", "Chemical Name"]
+
+    for key, specs in COLUMNS.items():
+        if columns.get(key):
+            first = specs[0][0]
+            fields += [first] + [f"{first} {header}" for header, _ in specs[1:]]
+
+    return fields
+
+
+def export_compounds(file_path, compounds, columns):
+    """Stream compounds into a new .xlsx, .csv or .jsonl file, in constant memory.
+
+    ``compounds`` may be any iterable, such as ``CompoundCache.iter_compounds()``;
+    rows are written as they arrive. Returns the number of rows written.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    count = 0
+
+    if ext in (".csv", ".jsonl"):
+        fields = record_fields(columns)
+
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f) if ext == ".csv" else None
+            if writer:
+                writer.writerow(fields)
+
+            for count, compound in enumerate(compounds, start=1):
+                row = build_row(count, compound, columns)
+                if writer:
+                    writer.writerow(row)
+                else:
+                    f.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n")
+
+        return count
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font
+    from openpyxl.utils import get_column_letter
+
+    # write_only workbooks flush each row to a temporary file as it is appended
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet("Chemicals")
+    headers = selected_headers(columns)
+
+    for col, (_, width) in enumerate(headers, start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+
+    header_cells = []
+    for header, _ in headers:
+        cell = WriteOnlyCell(sheet, value=header)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+        header_cells.append(cell)
+    sheet.append(header_cells)
+
+    for count, compound in enumerate(compounds, start=1):
+        sheet.append(build_row(count, compound, columns))
+
+    wb.save(file_path)
+    return count
+
+
+def detect_columns(file_path):
+    """Column selection of an existing log file, read from its header row."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        header_row = next(wb.active.iter_rows(max_row=1, values_only=True), ())
+    finally:
+        wb.close()
+
+    headers = [value for value in header_row if value]
+
+    return {key: specs[0][0] in headers for key, specs in COLUMNS.items()}
+
+
+class WorkbookSession:
+    """A log file kept open for the whole session, with appends batched.
+
+    ``append`` only queues rows; ``flush`` writes every queued row with one
+    save to a temporary file that then atomically replaces the log. If the
+    save fails, e.g. ``PermissionError`` while Excel holds the file, the
+    rows stay queued for the next ``flush``. Edits made to the file by
+    someone else between flushes are picked up rather than overwritten.
+    """
+
+    def __init__(self, file_path, columns=None):
+        self.file_path = file_path
+        self.columns = columns if columns is not None else detect_columns(file_path)
+        self.wb = None
+        self.mtime = None
+        self.queue = []
+        self.saving = 0                         # rows taken by a flush still in progress
+        self.lock = threading.Lock()            # guards the queue only, never held while saving
+        self.save_lock = threading.RLock()      # one flush at a time
+
+    @property
+    def pending(self):
+        with self.lock:
+            return len(self.queue) + self.saving
+
+    def append(self, compounds, columns=None):
+        """Queue rows for ``compounds``; serial numbers are assigned on flush.
+
+        Never waits for a save in progress, so it is safe on the UI thread.
+        """
+        rows = [build_row(None, compound, columns or self.columns) for compound in compounds]
+
+        with self.lock:
+            self.queue += rows
+        return len(rows)
+
+    def open(self):
+        from openpyxl import load_workbook
+
+        mtime = os.path.getmtime(self.file_path)
+
+        if self.wb is None or mtime != self.mtime:
+            self.wb = load_workbook(self.file_path)
+            self.mtime = mtime
+
+        return self.wb.active
+
+    def flush(self):
+        """Write all queued rows. Returns how many were saved."""
+        with self.save_lock:
+            with self.lock:
+                rows, self.queue = self.queue, []
+                self.saving = len(rows)
+
+            if not rows:
+                return 0
+
+            try:
+                sheet = self.open()
+                base = sheet.max_row
+
+                for sl_no, row in enumerate(rows, start=base):
+                    sheet.append([sl_no] + row[1:])
+
+                try:
+                    self.save()
+                except Exception:
+                    # Keep the in-memory sheet identical to the file on disk
+                    sheet.delete_rows(base + 1, len(rows))
+                    raise
+
+            except Exception:
+                with self.lock:
+                    self.queue = rows + self.queue
+                raise
+
+            finally:
+                with self.lock:
+                    self.saving = 0
+
+        return len(rows)
+
+    def save(self):
+        folder = os.path.dirname(os.path.abspath(self.file_path))
+        fd, tmp_path = tempfile.mkstemp(prefix="~labbuddy-", suffix=".xlsx", dir=folder)
+        os.close(fd)
+
+        try:
+            self.wb.save(tmp_path)
+            os.replace(tmp_path, self.file_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.mtime = os.path.getmtime(self.file_path)
+
+    def close(self):
+        """Flush what is left and release the workbook."""
+        with self.save_lock:
+            self.flush()
+            self.wb = None
+
+
+def append_compounds(file_path, compounds, columns):
+    """Append all compounds to the log file with a single load and save."""
+    session = WorkbookSession(file_path, columns)
+    session.append(compounds)
+    return session.flush()
+
+
+def read_name_list(file_path):
+    """First column of a CSV/TXT/XLSX file, without blanks or a header row."""
+    if file_path.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True)
+        try:
+            values = [row[0] for row in wb.active.iter_rows(values_only=True) if row]
+        finally:
+            wb.close()
+    else:
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            values = [row[0] for row in csv.reader(f) if row]
+
+    names = [str(v).strip() for v in values if v is not None and str(v).strip()]
+
+    if names and normalize_key(names[0]) in NAME_LIST_HEADERS:
+        names = names[1:]
+
+    return names
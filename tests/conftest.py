@@ -0,0 +1,123 @@
+import os
+import tempfile
+
+# lab_buddy.paths creates its data folder on import; keep it out of the real profile
+os.environ["LOCALAPPDATA"] = tempfile.mkdtemp(prefix="labbuddy-tests-")
+
+import pytest
+
+from lab_buddy.cache import CompoundCache
+from lab_buddy.core import LabBuddy
+from lab_buddy.images import ImageStore
+from lab_buddy.pictograms import PictogramStore
+from lab_buddy.pubchem import PubChemClient, PubChemOffline
+
+ACETONE_RECORD = {
+    "RecordTitle": "Acetone",
+    "Section": [{
+        "TOCHeading": "Safety and Hazards",
+        "Section": [{
+            "TOCHeading": "Hazards Identification",
+            "Section": [{
+                "TOCHeading": "GHS Classification",
+                "Information": [
+                    {"Name": "Pictogram(s)", "Value": {"StringWithMarkup": [{"Markup": [
+                        {"Type": "Icon", "URL": "https://pubchem.ncbi.nlm.nih.gov/images/ghs/GHS02.svg", "Extra": "Flammable"}
+                    ]}]}},
+                    {"Name": "GHS Hazard Statements", "Value": {"StringWithMarkup": [
+                        {"String": "H225: Highly flammable liquid and vapor"}
+                    ]}},
+                ],
+            }],
+        }],
+    }],
+}
+
+
+class StubClient(PubChemClient):
+    """PubChem as a dict of canned answers; anything else behaves as if offline."""
+
+    def __init__(self, record=ACETONE_RECORD):
+        super().__init__(retries=0)
+        self.record = record
+
+    def request(self, method, url, endpoint="pug", retries=None, **kwargs):
+        raise PubChemOffline("no network in tests")
+
+    def search_name(self, name):
+        if name.lower() != "acetone":
+            return None
+        return {"PC_Compounds": [{"id": {"id": {"cid": 180}}, "props": []}]}
+
+    def resolve_cid(self, name):
+        return 180 if name.lower() == "acetone" else None
+
+    def compound_record(self, cid):
+        if isinstance(self.record, Exception):
+            raise self.record
+        return self.record
+
+    def molecular_weight(self, cid):
+        return 58.08, "g/mol"
+
+    def synonyms(self, cid):
+        return ["acetone", "67-64-1", "propanone"]
+
+    def cids_by_cas(self, cas_numbers):
+        return {cas: 180 for cas in cas_numbers if cas == "67-64-1"}, {180: ["acetone", "67-64-1"]}
+
+    def properties_batch(self, cids):
+        return {cid: {"Title": "Acetone", "MolecularFormula": "C3H6O", "MolecularWeight": "58.08"} for cid in cids}
+
+    def synonyms_batch(self, cids):
+        return {cid: ["acetone", "67-64-1"] for cid in cids}
+
+
+def open_cache(folder):
+    return CompoundCache(
+        path=str(folder / "chemical_cache.db"),
+        legacy_path=str(folder / "chemical_cache.json"),
+        legacy_sig_path=str(folder / "chemical_cache.sig"),
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.load()
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def client():
+    return StubClient()
+
+
+@pytest.fixture
+def make_engine(tmp_path, client):
+    """Engine over a cache in ``tmp_path`` and the stub client; the cache is not loaded yet."""
+    engines = []
+
+    def make(cache=None, **kwargs):
+        engine = LabBuddy(
+            cache=cache if cache is not None else open_cache(tmp_path),
+            client=client,
+            images=ImageStore(root=str(tmp_path / "images")),
+            **kwargs
+        )
+        engine.pictograms = PictogramStore(client, root=str(tmp_path / "pictograms"))
+        engines.append(engine)
+        return engine
+
+    yield make
+
+    for engine in engines:
+        engine.close()
+
+
+@pytest.fixture
+def engine(make_engine):
+    engine = make_engine()
+    engine.load_cache()
+    return engine
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from lab_buddy import bulk
+
+TITLES = b"CID\tTitle\n180\tAcetone\n702\tEthanol\n887\tMethanol\n"
+SYNONYMS = b"180\tacetone\n180\t67-64-1\n702\tethanol\n702\t64-17-5\n887\tmethanol\n"
+
+
+def test_read_groups_yields_one_group_per_cid():
+    groups = list(bulk.read_groups(io.BytesIO(SYNONYMS)))
+
+    assert [(cid, rows) for cid, rows, _ in groups] == [
+        (180, [["acetone"], ["67-64-1"]]),
+        (702, [["ethanol"], ["64-17-5"]]),
+        (887, [["methanol"]]),
+    ]
+
+
+def test_read_groups_offsets_are_resume_points():
+    groups = list(bulk.read_groups(io.BytesIO(SYNONYMS)))
+    assert groups[-1][2] == len(SYNONYMS)
+
+    f = io.BytesIO(SYNONYMS)
+    f.seek(groups[0][2])
+    assert [cid for cid, _, _ in bulk.read_groups(f)] == [702, 887]
+
+
+def test_read_groups_skips_header_and_damaged_lines():
+    data = b"CID\tTitle\ngarbage\n180\tAcetone\n\n702\tEthanol"
+    assert [cid for cid, _, _ in bulk.read_groups(io.BytesIO(data))] == [180, 702]
+
+
+def test_detect_kind():
+    assert bulk.detect_kind("/data/CID-Synonym-filtered.gz") == "synonym"
+    assert bulk.detect_kind("CID-Title") == "title"
+    assert bulk.detect_kind("compounds.tsv") is None
+
+
+def test_import_resumes_after_interruption(cache, tmp_path):
+    path = tmp_path / "CID-Title"
+    path.write_bytes(TITLES)
+
+    merge_cid = cache.merge_cid
+    calls = []
+
+    def flaky(cid, fields=None, synonyms=None):
+        calls.append(cid)
+        if cid == 887 and calls.count(887) == 1:
+            raise KeyboardInterrupt
+        return merge_cid(cid, fields, synonyms)
+
+    cache.merge_cid = flaky
+    with pytest.raises(KeyboardInterrupt):
+        bulk.import_extract(cache, str(path), batch=1)
+
+    messages = []
+    summary = bulk.import_extract(cache, str(path), batch=1, log=messages.append)
+
+    assert summary["compounds"] == 1   # only the CID after the saved offset
+    assert calls == [180, 702, 887, 887]
+    assert any(message.startswith("↻ Resuming") for message in messages)
+    assert [cache.get(name).cid for name in ("acetone", "ethanol", "methanol")] == [180, 702, 887]
+    assert bulk.import_extract(cache, str(path))["status"] == "done"
+
+
+def test_import_is_order_independent(cache, tmp_path):
+    (tmp_path / "CID-Synonym-filtered").write_bytes(SYNONYMS)
+    (tmp_path / "CID-Title").write_bytes(TITLES)
+
+    bulk.import_extract(cache, str(tmp_path / "CID-Synonym-filtered"))
+    bulk.import_extract(cache, str(tmp_path / "CID-Title"))
+
+    ethanol = cache.get("64-17-5")
+    assert (ethanol.name, ethanol.cid) == ("Ethanol", 702)
+    assert cache.get("acetone").cas == "67-64-1"
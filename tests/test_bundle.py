@@ -0,0 +1,76 @@
+import gzip
+
+import pytest
+from conftest import open_cache
+
+from lab_buddy import bundle
+from lab_buddy.compound import Compound
+
+
+@pytest.fixture
+def other(tmp_path):
+    folder = tmp_path / "other"
+    folder.mkdir()
+    cache = open_cache(folder)
+    cache.load()
+    yield cache
+    cache.close()
+
+
+def fill(cache):
+    cache.add(Compound(name="Acetone", cid=180, cas="67-64-1", ts=100, synonyms=["propanone"]))
+    cache.add(Compound(name="Ethanol", cid=702, cas="64-17-5", ts=200))
+    cache.save()
+
+
+def test_round_trip(cache, other, tmp_path):
+    fill(cache)
+    path = str(tmp_path / "cache.lbb")
+
+    assert bundle.export_bundle(cache, path) == 2
+    assert bundle.merge_bundle(other, path) == {"added": 2, "updated": 0, "kept": 0}
+    assert other.get("propanone").cid == 180
+    assert bundle.merge_bundle(other, path) == {"added": 0, "updated": 0, "kept": 2}
+
+
+def test_since_limits_the_export(cache, tmp_path):
+    fill(cache)
+    assert bundle.export_bundle(cache, str(tmp_path / "new.lbb"), since=150) == 1
+
+
+def test_tampered_bundle_is_rejected(cache, other, tmp_path):
+    fill(cache)
+    path = tmp_path / "cache.lbb"
+    bundle.export_bundle(cache, str(path))
+
+    data = gzip.decompress(path.read_bytes()).replace(b"64-17-5", b"64-17-6")
+    path.write_bytes(gzip.compress(data))
+
+    with pytest.raises(bundle.BundleError, match="integrity"):
+        bundle.merge_bundle(other, str(path))
+    assert len(other) == 0
+
+
+def test_truncated_and_foreign_files_are_rejected(cache, tmp_path):
+    fill(cache)
+    path = tmp_path / "cache.lbb"
+    bundle.export_bundle(cache, str(path))
+
+    lines = gzip.decompress(path.read_bytes()).splitlines(keepends=True)
+    path.write_bytes(gzip.compress(b"".join(lines[:-1])))
+    with pytest.raises(bundle.BundleError, match="truncated"):
+        bundle.verify_bundle(str(path))
+
+    path.write_bytes(b"not gzip at all")
+    with pytest.raises(bundle.BundleError):
+        bundle.verify_bundle(str(path))
+
+
+def test_shared_key(cache, tmp_path):
+    fill(cache)
+    path = str(tmp_path / "cache.lbb")
+    bundle.export_bundle(cache, path, key="lab-secret")
+
+    assert bundle.verify_bundle(path, key="lab-secret")["signed"]
+    with pytest.raises(bundle.BundleError, match="shared key"):
+        bundle.verify_bundle(path, key="wrong")
@@ -0,0 +1,37 @@
+from lab_buddy.compound import Compound
+
+
+def test_add_and_find_by_name_cas_and_synonym(cache):
+    cache.add(Compound(name="Acetone", cid=180, cas="67-64-1", ts=1, synonyms=["propanone"]))
+    cache.save()
+
+    assert cache.get("  ACETONE ").cid == 180
+    assert cache.get("67-64-1").cid == 180
+    assert cache.get("propanone").cid == 180
+    assert cache.get("butanone") is None
+
+
+def test_merge_cid_keeps_compounds_sharing_a_title_apart(cache):
+    # CIDs 5793 and 79025 are both titled "Glucose" on PubChem
+    assert cache.merge_cid(5793, {"name": "Glucose"}) == "glucose"
+    assert cache.merge_cid(79025, {"name": "Glucose"}) == "glucose (cid 79025)"
+    # Importing the extract again lands on the same keys
+    assert cache.merge_cid(79025, {"name": "Glucose"}, ["D-glucopyranose"]) == "glucose (cid 79025)"
+    cache.save()
+
+    assert len(cache) == 2
+    assert cache.get("glucose").cid == 5793
+    assert cache.get_by_cid(79025).name == "Glucose (CID 79025)"
+    assert "glucose" in cache.synonyms("glucose (cid 79025)")
+
+
+def test_merge_record_does_not_replace_a_namesake(cache):
+    cache.merge_cid(5793, {"name": "Glucose"})
+
+    assert cache.merge_record("glucose", {"cid": 79025, "name": "Glucose", "ts": 5}) == "added"
+    assert cache.merge_record("glucose", {"cid": 79025, "name": "Glucose", "ts": 6}) == "updated"
+    cache.save()
+
+    assert len(cache) == 2
+    assert cache.get("glucose").cid == 5793
+    assert cache.get_by_cid(79025).name == "Glucose (CID 79025)"
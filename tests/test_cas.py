@@ -0,0 +1,23 @@
+import pytest
+
+from lab_buddy.cas import is_valid_cas, looks_like_cas, normalize_cas
+
+
+@pytest.mark.parametrize("text", ["67-64-1", "7732-18-5", "64-17-5", " 50-00-0 ", "0067-64-1"])
+def test_valid_cas_numbers(text):
+    assert is_valid_cas(text)
+
+
+@pytest.mark.parametrize("text", ["67-64-2", "7732-18-4", "67641", "6-64-1", "67-6-1", "acetone", "", None])
+def test_invalid_cas_numbers(text):
+    assert not is_valid_cas(text)
+
+
+def test_wrong_check_digit_still_looks_like_cas():
+    assert looks_like_cas("67-64-2")
+    assert not is_valid_cas("67-64-2")
+
+
+def test_normalize_cas():
+    assert normalize_cas(" 0067-64-1") == "67-64-1"
+    assert normalize_cas("67-64-2") is None
@@ -0,0 +1,164 @@
+import sqlite3
+import time
+
+import pytest
+from conftest import open_cache
+
+from lab_buddy import cli
+from lab_buddy.compound import Compound
+from lab_buddy.pubchem import structure_image_url
+
+ACETONE = dict(
+    name="Acetone", cid=180, cas="67-64-1", formula="C3H6O", mw=58.08,
+    iupac="propan-2-one", smiles="CC(=O)C", ghs=["H225: Highly flammable liquid and vapor"],
+    pictograms=[{"url": "https://pubchem.ncbi.nlm.nih.gov/images/ghs/GHS02.svg", "label": "Flammable"}],
+    image=structure_image_url(180),
+)
+
+
+def cached(cache, **fields):
+    compound = Compound(**dict(ACETONE, **fields))
+    cache.add(compound)
+    cache.save()
+    return cache.get(compound.name)
+
+
+def test_lookup_fetches_and_caches(engine):
+    compound = engine.lookup("acetone")
+
+    assert (compound.cid, compound.cas, compound.mw) == (180, "67-64-1", 58.08)
+    assert compound.ghs and compound.ts
+    assert engine.cache.get("propanone").cid == 180
+
+
+def test_invalid_cas_is_rejected_before_any_lookup(engine):
+    assert engine.lookup("67-64-2") is None
+    assert engine.lookup("67-64-1").cid == 180
+
+
+def test_revalidate_with_failed_record_keeps_cached_data(engine, client):
+    old = cached(engine.cache, ts=1000)
+    client.record = TimeoutError("PUG-View timed out")
+    updates = []
+
+    assert engine.revalidate(old, on_update=updates.append) is None
+    assert updates == []
+
+    kept = engine.cache.get("acetone")
+    assert (kept.iupac, kept.smiles, kept.ghs, kept.pictograms) == (old.iupac, old.smiles, old.ghs, old.pictograms)
+    assert kept.ts == 1000
+
+
+def test_revalidate_never_replaces_known_values(engine, client):
+    old = cached(engine.cache, ts=1000, dens=0.79, dens_u="g/cm³")
+    client.molecular_weight = lambda cid: (None, None)
+
+    # The stub record has hazards but no IUPAC name, SMILES or density
+    assert engine.revalidate(old) is None
+
+    kept = engine.cache.get("acetone")
+    assert (kept.mw, kept.dens, kept.iupac, kept.smiles) == (58.08, 0.79, "propan-2-one", "CC(=O)C")
+    assert kept.ts > 1000
+
+
+def test_record_that_timed_out_is_cached_as_stale(engine, client):
+    client.record = TimeoutError("PUG-View timed out")
+
+    compound = engine.lookup("acetone")
+
+    assert compound.ts == 0
+    assert engine.is_stale(engine.cache.get("acetone"))
+
+
+def test_fetch_many_marks_records_without_hazards_stale(engine):
+    result, = engine.fetch_many(["acetone"], with_density=False)
+    assert result.compound.ts == 0 and engine.cache.get("acetone").ts == 0
+
+
+def test_fetch_many_with_record_fills_hazards(engine):
+    result, = engine.fetch_many(["acetone"])
+    assert result.compound.ghs and result.compound.pictograms
+    assert not engine.is_stale(engine.cache.get("acetone"))
+
+
+def test_stale_record_is_refreshed_before_returning_without_on_update(engine):
+    cached(engine.cache, ts=1000, ghs=[], pictograms=[])
+
+    compound = engine.lookup("acetone")
+
+    assert compound.ghs and compound.ts > 1000
+    assert engine.cache.get("acetone").ghs
+
+
+def test_cli_ttl_refreshes_stale_records(make_engine, client, tmp_path, monkeypatch):
+    cache = open_cache(tmp_path)
+    cache.load()
+    cached(cache, ts=1000, ghs=[], pictograms=[])
+    cache.close()
+
+    record = client.compound_record
+    def slow_record(cid):
+        time.sleep(0.3)   # a background refresh would still be running at exit
+        return record(cid)
+
+    monkeypatch.setattr(client, "compound_record", slow_record)
+    monkeypatch.setattr(cli, "LabBuddy", lambda **kwargs: make_engine(**kwargs))
+
+    assert cli.main(["--ttl", "1", "search", "acetone"]) == 0
+
+    cache.load()
+    assert cache.get("acetone").ghs and cache.get("acetone").ts > 1000
+    cache.close()
+
+
+def test_offline_lookup_never_substitutes_a_similar_name(engine):
+    cached(engine.cache, name="Ethanol", cid=702, ts=time.time())
+    cached(engine.cache, name="1-Propanol", cid=1031, ts=time.time())
+
+    assert engine.lookup("methanol", online=False) is None
+    assert engine.lookup("2-propanol", online=False) is None
+    assert "Ethanol" in engine.suggest_cached("methanol")
+
+
+def test_cli_offline_search_fails_with_suggestions(make_engine, monkeypatch, capsys):
+    engine = make_engine()
+    engine.load_cache()
+    cached(engine.cache, name="Ethanol", cid=702, ts=time.time())
+    engine.cache.close()
+    monkeypatch.setattr(cli, "LabBuddy", lambda **kwargs: make_engine(**kwargs))
+
+    assert cli.main(["search", "--offline", "methanol"]) == 1
+    assert "did you mean Ethanol" in capsys.readouterr().err
+
+
+def test_pictogram_download_failure_does_not_fail_lookups(engine):
+    cached(engine.cache, ts=time.time())
+
+    compound = engine.lookup("acetone", images=True)   # no network, connectivity unknown
+    assert compound.pictograms and compound.pictogram_data == {}
+
+    fetched = engine.fetch_cid(180, images=True)
+    assert fetched.ghs and fetched.pictogram_data == {}
+
+
+def test_unopenable_cache_falls_back_to_pubchem(make_engine, tmp_path):
+    (tmp_path / "chemical_cache.db").mkdir()
+    engine = make_engine()
+
+    with pytest.raises(sqlite3.Error):
+        engine.load_cache()
+
+    assert not engine.cache_usable()
+    assert engine.lookup("acetone").cid == 180
+    assert engine.lookup("67-64-1").cid == 180
+    assert engine.lookup("acetone", online=False) is None
+    assert engine.fetch_many(["acetone"])[0].status == "ok"
+
+
+def test_cas_lookup_survives_a_failed_save(engine, monkeypatch):
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(engine.cache, "save", locked)
+    assert engine.cas_cid("67-64-1") == 180
+    assert engine.cache.cid_for_cas("67-64-1") == 180
@@ -0,0 +1,46 @@
+from lab_buddy.index import PrefixIndex, TrigramIndex, trigrams
+
+
+def test_prefix_search_returns_distinct_names_in_term_order():
+    index = PrefixIndex()
+    index.build([("acetone", "Acetone"), ("67-64-1", "Acetone"), ("acetic acid", "Acetic acid"),
+                 ("acetonitrile", "Acetonitrile"), ("propanone", "Acetone")])
+
+    assert index.search("acet") == ["Acetic acid", "Acetone", "Acetonitrile"]
+    assert index.search("acet", limit=2) == ["Acetic acid", "Acetone"]
+    assert index.search("67-") == ["Acetone"]
+    assert index.search("xyz") == []
+
+
+def test_prefix_add_keeps_order_and_skips_duplicates():
+    index = PrefixIndex()
+    for term, name in [("toluene", "Toluene"), ("benzene", "Benzene"), ("toluene", "Toluene"), ("", "Empty")]:
+        index.add(term, name)
+
+    assert len(index) == 2
+    assert index.entries == sorted(index.entries)
+    assert index.search("") == ["Benzene", "Toluene"]
+
+
+def test_trigrams_ignore_case_spaces_and_punctuation():
+    assert trigrams("dimethyl sulfoxide") == trigrams("Dimethylsulfoxide")
+    assert trigrams("--") == set()
+
+
+def test_trigram_search_tolerates_typos():
+    index = TrigramIndex()
+    index.build([("acetone", "Acetone"), ("acetonitrile", "Acetonitrile"), ("ethanol", "Ethanol")])
+
+    name, score = index.search("acetnoe")[0]
+    assert name == "Acetone"
+    assert 0 < score < 1
+    assert index.search("acetone")[0] == ("Acetone", 1.0)
+
+
+def test_trigram_search_scores_each_name_once_and_respects_min_score():
+    index = TrigramIndex()
+    index.build([("ethanol", "Ethanol"), ("ethyl alcohol", "Ethanol"), ("ethanol", "Ethanol")])
+
+    assert len(index) == 2
+    assert [name for name, _ in index.search("ethanol")] == ["Ethanol"]
+    assert index.search("benzene", min_score=0.4) == []
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import load_workbook
+
+from lab_buddy import workbook
+from lab_buddy.compound import Compound
+
+ACETONE = Compound(name="Acetone", cid=180, cas="67-64-1", formula="C3H6O", mw=58.08)
+ETHANOL = Compound(name="Ethanol", cid=702, cas="64-17-5", formula="C2H6O", mw=46.07)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = str(tmp_path / "log.xlsx")
+    workbook.create_workbook(path, workbook.DEFAULT_COLUMNS)
+    return path
+
+
+def logged_names(path):
+    sheet = load_workbook(path).active
+    return [row[1] for row in sheet.iter_rows(min_row=2, values_only=True)]
+
+
+def test_append_only_queues_until_flush(log_file):
+    session = workbook.WorkbookSession(log_file)
+
+    assert session.append([ACETONE, ETHANOL]) == 2
+    assert session.pending == 2
+    assert logged_names(log_file) == []
+
+    assert session.flush() == 2
+    assert session.pending == 0
+    assert logged_names(log_file) == ["Acetone", "Ethanol"]
+
+
+def test_locked_file_requeues_rows(log_file, monkeypatch):
+    session = workbook.WorkbookSession(log_file)
+    session.append([ACETONE])
+
+    def locked():
+        raise PermissionError("file is open in Excel")
+
+    monkeypatch.setattr(session, "save", locked)
+    with pytest.raises(PermissionError):
+        session.flush()
+    assert session.pending == 1
+
+    session.append([ETHANOL])
+    monkeypatch.undo()
+
+    assert session.flush() == 2
+    assert logged_names(log_file) == ["Acetone", "Ethanol"]
+    sheet = load_workbook(log_file).active
+    assert [row[0] for row in sheet.iter_rows(min_row=2, values_only=True)] == [1, 2]
+
+
+def test_switching_files_keeps_rows_the_user_did_not_give_up(log_file, tmp_path, monkeypatch):
+    from lab_buddy import main
+
+    session = workbook.WorkbookSession(log_file)
+    session.append([ACETONE])
+    app = SimpleNamespace(
+        excel_session=session,
+        excel_file=log_file,
+        excel_locked=True,
+        flush_excel=lambda: False,   # the current log is locked
+        selected_columns=lambda: workbook.DEFAULT_COLUMNS,
+    )
+    other = str(tmp_path / "other.xlsx")
+
+    monkeypatch.setattr(main.messagebox, "askyesno", lambda *args: False)
+    assert not main.PubChemScraperApp.open_excel_session(app, other, create=True)
+    assert app.excel_session is session and session.pending == 1
+
+    monkeypatch.setattr(main.messagebox, "askyesno", lambda *args: True)
+    assert main.PubChemScraperApp.open_excel_session(app, other, create=True)
+    assert app.excel_session.file_path == other